@@ -1,17 +1,70 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify, session, send_from_directory
-from flask_scss import Scss
+import importlib
+import os
+import time
+from contextlib import contextmanager
+
+class StartupProfile:
+    """Wall-clock cost of each startup component, printed when STARTUP_PROFILE=true"""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.timings = []  # (component, seconds)
+        self.first_request_started = None
+
+    @contextmanager
+    def phase(self, component):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((component, time.perf_counter() - started))
+
+    def import_modules(self, names):
+        """Import names one at a time so each dependency's import cost is reported on its own"""
+        if self.enabled:
+            for name in names:
+                with self.phase(f'import {name}'):
+                    importlib.import_module(name)
+
+    def report(self):
+        if not self.enabled:
+            return
+        elapsed = time.perf_counter() - self.started
+        print("Startup profile:")
+        for component, seconds in self.timings:
+            print(f"  {component:<24} {seconds * 1000:8.1f} ms")
+        other = elapsed - sum(seconds for _, seconds in self.timings)
+        print(f"  {'other module code':<24} {other * 1000:8.1f} ms")
+        print(f"  {'total import':<24} {elapsed * 1000:8.1f} ms")
+
+startup_profile = StartupProfile(os.environ.get('STARTUP_PROFILE', 'False').lower() == 'true')
+# Each module only costs what the ones before it did not already load
+startup_profile.import_modules(['werkzeug', 'flask', 'sqlalchemy', 'flask_sqlalchemy', 'flask_cors'])
+
+from flask import Flask, render_template, request, redirect, url_for, jsonify, session, g, send_from_directory, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-from datetime import datetime
+from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from sqlalchemy import Index, event, create_engine
+from werkzeug.exceptions import ClientDisconnected
+from sqlalchemy import Index, event, create_engine, or_, and_, inspect, text
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.url import make_url
-import os
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
 import json
 import uuid
 import re
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from collections import OrderedDict
+import queue
 
 app = Flask(__name__)
 
@@ -19,7 +72,46 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', 'uploads')
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max request body (multipart upload or one upload-session chunk)
+app.config['UPLOAD_CHUNK_SIZE'] = 1024 * 1024  # Bytes read from the request stream per write when saving uploads
+# Where uploaded file data lives: 'local' (UPLOAD_FOLDER) or 's3' (any S3-compatible object store,
+# so multiple instances can share files without sharing a disk)
+app.config['STORAGE_BACKEND'] = os.environ.get('STORAGE_BACKEND', 'local')
+app.config['S3_BUCKET'] = os.environ.get('S3_BUCKET')
+app.config['S3_PREFIX'] = os.environ.get('S3_PREFIX', '')
+app.config['S3_ENDPOINT_URL'] = os.environ.get('S3_ENDPOINT_URL')  # e.g. http://localhost:9000 for MinIO
+app.config['S3_REGION'] = os.environ.get('S3_REGION')
+app.config['S3_PRESIGN_EXPIRES'] = int(os.environ.get('S3_PRESIGN_EXPIRES', '300'))  # Seconds a download redirect stays valid
+# Stored data not referenced by any row is only garbage-collected once it is this old (seconds)
+app.config['STORAGE_GC_GRACE_SECONDS'] = int(os.environ.get('STORAGE_GC_GRACE_SECONDS', '3600'))
+# Hand file downloads to a fronting proxy (nginx/Apache X-Sendfile) instead of streaming them from Python
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', 'False').lower() == 'true'
+# Seconds a worker may reuse a user's profile and group visibility before re-reading them
+# (changes made through this worker are applied immediately; 0 disables the process cache)
+app.config['AUTH_CACHE_TTL'] = float(os.environ.get('AUTH_CACHE_TTL', '30'))
+# Password hashing: Werkzeug method string ('scrypt', 'scrypt:<n>:<r>:<p>', 'pbkdf2:sha256:<iterations>')
+# and the number of worker processes hashing concurrently (0 hashes in the request thread). Stored
+# hashes made with other parameters are replaced the next time their user logs in.
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', '2'))
+# Serialized experiment/group listings: 'memory' (per worker, LRU), 'redis' (shared by all workers
+# and instances) or 'none'. Use 'redis' when running more than one worker process.
+app.config['RESULT_CACHE_BACKEND'] = os.environ.get('RESULT_CACHE_BACKEND', 'memory')
+app.config['RESULT_CACHE_TTL'] = int(os.environ.get('RESULT_CACHE_TTL', '60'))  # Seconds a cached listing may be served
+app.config['RESULT_CACHE_MAX_BYTES'] = int(os.environ.get('RESULT_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))  # 'memory' backend size bound
+app.config['RESULT_CACHE_REDIS_URL'] = os.environ.get('RESULT_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+# Change feed (GET /api/events): how often each worker checks the outbox for events written by
+# other workers, how long one stream stays open before the client reconnects, and event retention
+app.config['CHANGE_FEED_POLL_SECONDS'] = float(os.environ.get('CHANGE_FEED_POLL_SECONDS', '1'))
+app.config['CHANGE_FEED_STREAM_SECONDS'] = int(os.environ.get('CHANGE_FEED_STREAM_SECONDS', '300'))
+app.config['CHANGE_FEED_RETENTION_SECONDS'] = int(os.environ.get('CHANGE_FEED_RETENTION_SECONDS', '86400'))
+# Each open stream holds a worker thread for up to CHANGE_FEED_STREAM_SECONDS; beyond this many
+# per worker process, /api/events answers 503 so ordinary requests keep threads to run on.
+# Keep it well below gunicorn's --threads (32 in the Dockerfile).
+app.config['CHANGE_FEED_MAX_STREAMS'] = int(os.environ.get('CHANGE_FEED_MAX_STREAMS', '16'))
+# Deletions are reported to incremental sync clients for this many days; clients that have not
+# synced for longer must download everything again
+app.config['SYNC_TOMBSTONE_RETENTION_DAYS'] = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', '90'))
 
 # Database configuration
 # Supports both SQLite (default for local dev) and PostgreSQL (for production/Cloud SQL)
@@ -62,12 +154,14 @@ else:
         'isolation_level': None,  # SERIALIZABLE for SQLite
     }
 
-# Create uploads directory if it doesn't exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Apply pending schema migrations when a worker starts. On by default for SQLite, whose database
+# lives with the instance; off for PostgreSQL, where `flask db-upgrade` runs once per deploy
+app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', 'false' if is_using_postgres else 'true').lower() == 'true'
 
 # CORS configuration - allow frontend origin from environment variable
 allowed_origins = os.environ.get('CORS_ORIGINS', 'http://localhost:5173,http://localhost:3000').split(',')
-CORS(app, origins=allowed_origins, supports_credentials=True)
+with startup_profile.phase('CORS'):
+    CORS(app, origins=allowed_origins, supports_credentials=True)
 
 # Session cookie configuration for cross-origin requests
 # Secure=True is required for SameSite=None in production (HTTPS)
@@ -77,7 +171,8 @@ app.config['SESSION_COOKIE_SAMESITE'] = 'None'
 app.config['SESSION_COOKIE_SECURE'] = is_production  # True for HTTPS (production), False for HTTP (local)
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 
-db = SQLAlchemy(app)
+with startup_profile.phase('SQLAlchemy'):
+    db = SQLAlchemy(app)
 
 # Database-specific connection configuration
 @event.listens_for(Engine, "connect")
@@ -124,6 +219,16 @@ def validate_experiment_id(exp_id):
     pattern = r'^[a-zA-Z0-9_-]+$'
     return bool(re.match(pattern, exp_id)) and len(exp_id) <= 50
 
+def validate_date_string(value):
+    """Validate ISO date strings (YYYY-MM-DD) used for start date filters"""
+    if not value or not isinstance(value, str):
+        return False
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return False
+    return True
+
 def sanitize_string_input(value, max_length=500):
     """Sanitize string input by trimming and limiting length"""
     if not isinstance(value, str):
@@ -137,6 +242,8 @@ class Group(db.Model):
     code = db.Column(db.String(20), unique=True, nullable=False)  # Join code
     created_by_id = db.Column(db.Integer, nullable=False)  # Will reference User.id
     date_created = db.Column(db.DateTime, default=datetime.now)
+    # Incremented whenever the group's members (or their names) change; used as an HTTP validator
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     members = db.relationship('GroupMember', backref='group', lazy=True, cascade='all, delete-orphan')
     
@@ -145,14 +252,22 @@ class Group(db.Model):
         Index('idx_group_created_by', 'created_by_id'),  # For queries filtering by created_by_id
     )
     
-    def to_dict(self):
-        creator = User.query.get(self.created_by_id) if self.created_by_id else None
+    def to_dict(self, creator_name=None, member_count=None):
+        # Listings pass creator_name/member_count from group_summary_select(); otherwise they are
+        # looked up here (a COUNT, never loading the membership rows)
+        if creator_name is None and self.created_by_id:
+            creator = db.session.get(User, self.created_by_id)
+            creator_name = creator.name if creator else None
+        if member_count is None:
+            member_count = db.session.scalar(
+                db.select(db.func.count(GroupMember.id)).where(GroupMember.group_id == self.id)
+            )
         return {
             'id': self.id,
             'name': self.name,
             'code': self.code,
-            'createdBy': creator.name if creator else 'Unknown',
-            'memberCount': len(self.members),
+            'createdBy': creator_name or 'Unknown',
+            'memberCount': member_count,
             'dateCreated': self.date_created.isoformat() if self.date_created else None
         }
 
@@ -191,15 +306,26 @@ class Experiment(db.Model):
     protocol = db.Column(db.Text, nullable=True)
     analysis = db.Column(db.Text, nullable=True, default='')
     date_created = db.Column(db.DateTime, default=datetime.now)
+    # Incremented by every write to the experiment or its logs/files; exposed as the ETag
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    date_updated = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)  # Drives incremental sync
     
     logs = db.relationship('ExperimentLog', backref='experiment', lazy=True, cascade='all, delete-orphan', order_by='ExperimentLog.timestamp')
     files = db.relationship('ExperimentFile', backref='experiment', lazy=True, cascade='all, delete-orphan', order_by='ExperimentFile.date_created')
+    upload_sessions = db.relationship('UploadSession', backref='experiment', lazy=True, cascade='all, delete-orphan')
     
     # Indexes for frequently queried columns
     __table_args__ = (
         Index('idx_experiment_owner', 'owner_id'),  # For queries filtering by owner_id
         Index('idx_experiment_owner_exp', 'owner_id', 'exp_id'),  # Composite index for common query pattern
         Index('idx_experiment_status', 'status'),  # For filtering by status
+        # Keyset pagination: visibility filters by owner, then walks (sort key, id)
+        Index('idx_experiment_owner_created', 'owner_id', 'date_created', 'id'),
+        Index('idx_experiment_owner_start', 'owner_id', 'start_date', 'id'),
+        Index('idx_experiment_status_created', 'status', 'date_created', 'id'),
+        Index('idx_experiment_owner_updated', 'owner_id', 'date_updated', 'id'),  # For incremental sync
+        # Covers the dashboard statistics aggregate (and its validators) without reading table rows
+        Index('idx_experiment_owner_status', 'owner_id', 'status', 'date_updated', 'id'),
     )
     
     def to_dict(self):
@@ -213,6 +339,7 @@ class Experiment(db.Model):
             'hypothesis': self.hypothesis or '',
             'protocol': self.protocol or '',
             'analysis': self.analysis or '',
+            'version': self.version,
             'logs': [log.to_dict() for log in self.logs],
             'files': [file.to_dict() for file in self.files]
         }
@@ -223,14 +350,17 @@ class ExperimentLog(db.Model):
     timestamp = db.Column(db.String(100), nullable=False)
     content = db.Column(db.Text, nullable=False)
     date_created = db.Column(db.DateTime, default=datetime.now)
+    date_updated = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     
     # Index for frequently queried foreign key
     __table_args__ = (
         Index('idx_experiment_log_experiment', 'experiment_id'),  # For queries filtering by experiment_id
+        Index('idx_experiment_log_updated', 'date_updated', 'id'),  # For incremental sync
     )
     
     def to_dict(self):
         return {
+            'id': self.id,
             'timestamp': self.timestamp,
             'content': self.content
         }
@@ -241,14 +371,17 @@ class ExperimentFile(db.Model):
     filename = db.Column(db.String(500), nullable=False)
     original_filename = db.Column(db.String(500), nullable=False)
     file_path = db.Column(db.String(1000), nullable=False)
-    file_size = db.Column(db.Integer, nullable=False)
+    file_size = db.Column(db.BigInteger, nullable=False)
     mime_type = db.Column(db.String(100), nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True)  # SHA-256 hex digest, computed while saving
     date_created = db.Column(db.DateTime, default=datetime.now)
+    date_updated = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     
     # Indexes for frequently queried columns
     __table_args__ = (
         Index('idx_experiment_file_experiment', 'experiment_id'),  # For queries filtering by experiment_id
         Index('idx_experiment_file_composite', 'experiment_id', 'id'),  # Composite index for common query pattern
+        Index('idx_experiment_file_updated', 'date_updated', 'id'),  # For incremental sync
     )
     
     def to_dict(self):
@@ -257,6 +390,94 @@ class ExperimentFile(db.Model):
             'filename': self.original_filename,
             'fileSize': self.file_size,
             'mimeType': self.mime_type,
+            'sha256': self.content_hash,
+            'dateCreated': self.date_created.isoformat() if self.date_created else None
+        }
+
+class Tombstone(db.Model):
+    """A deleted experiment, log or file, kept so incremental sync clients learn about the deletion
+
+    Rows with a viewer_id record that one user lost read access to an experiment (its owner no
+    longer shares a group with them) and are reported to that user only.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # 'experiment', 'log' or 'file'
+    record_id = db.Column(db.Integer, nullable=False)  # Primary key of the deleted row
+    exp_id = db.Column(db.String(50), nullable=False)  # Experiment the row belonged to
+    owner_id = db.Column(db.Integer, nullable=False)  # Experiment owner, for visibility
+    viewer_id = db.Column(db.Integer, nullable=True)  # Only user told about it, for lost access
+    date_deleted = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    
+    __table_args__ = (
+        Index('idx_tombstone_owner_deleted', 'owner_id', 'date_deleted', 'id'),  # For incremental sync
+        Index('idx_tombstone_viewer_deleted', 'viewer_id', 'date_deleted', 'id'),  # For incremental sync
+        Index('idx_tombstone_deleted', 'date_deleted'),  # For pruning
+    )
+
+class FileBlob(db.Model):
+    """Content-addressed file data, shared by every ExperimentFile with the same SHA-256"""
+    content_hash = db.Column(db.String(64), primary_key=True)  # Also the blob's file name under UPLOAD_FOLDER/blobs
+    file_size = db.Column(db.BigInteger, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)  # Number of ExperimentFile rows linked to this blob
+    date_created = db.Column(db.DateTime, default=datetime.now)
+
+class StorageCleanupJob(db.Model):
+    """Stored data waiting to be deleted by the background cleanup worker"""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # 'blob', 'key' or 'partial'
+    target = db.Column(db.String(1000), nullable=False)  # Content hash, storage key or upload session id
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.String(500), nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=True)  # Retry backoff after a failure (None: due now)
+    date_created = db.Column(db.DateTime, default=datetime.now)
+
+class ChangeEvent(db.Model):
+    """Outbox of change-feed events; every worker's feed poller delivers new rows to its subscribers"""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # e.g. 'experiment.updated', 'membership.joined'
+    data = db.Column(db.Text, nullable=False)  # JSON event body sent to clients
+    date_created = db.Column(db.DateTime, default=datetime.now)
+    
+    __table_args__ = (
+        Index('idx_change_event_created', 'date_created'),  # For pruning old events
+        # Ids must never be reused after pruning: clients resume from the last id they saw
+        {'sqlite_autoincrement': True},
+    )
+
+class ChangeEventRecipient(db.Model):
+    """Users allowed to receive a change event, resolved when the change is made"""
+    event_id = db.Column(db.Integer, db.ForeignKey('change_event.id'), primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    
+    __table_args__ = (
+        Index('idx_change_event_recipient_user', 'user_id', 'event_id'),  # For replaying a user's missed events
+    )
+
+class UploadSession(db.Model):
+    """An in-progress resumable upload; chunks are appended to a partial file in UPLOAD_FOLDER"""
+    id = db.Column(db.String(36), primary_key=True)  # Upload session id handed to the client
+    experiment_id = db.Column(db.Integer, db.ForeignKey('experiment.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    original_filename = db.Column(db.String(500), nullable=False)
+    mime_type = db.Column(db.String(100), nullable=True)
+    total_size = db.Column(db.BigInteger, nullable=True)  # Declared by the client, if known
+    bytes_received = db.Column(db.BigInteger, nullable=False, default=0)
+    # 'open' while accepting chunks, 'completing' once a complete request has claimed it
+    status = db.Column(db.String(20), nullable=False, default='open', server_default='open')
+    date_created = db.Column(db.DateTime, default=datetime.now)
+    
+    __table_args__ = (
+        Index('idx_upload_session_experiment', 'experiment_id'),  # For cascading deletes by experiment
+    )
+    
+    def to_dict(self):
+        return {
+            'uploadId': self.id,
+            'filename': self.original_filename,
+            'mimeType': self.mime_type,
+            'totalSize': self.total_size,
+            'offset': self.bytes_received,
+            'status': self.status,
             'dateCreated': self.date_created.isoformat() if self.date_created else None
         }
 
@@ -283,6 +504,12 @@ class GroupMember(db.Model):
             'dateJoined': self.date_joined.isoformat() if self.date_joined else None
         }
 
+class SchemaMigration(db.Model):
+    """A schema migration step applied to this database (see MIGRATIONS)"""
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    description = db.Column(db.String(200), nullable=False)
+    date_applied = db.Column(db.DateTime, default=datetime.now)
+
 class Profile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(200), nullable=False)
@@ -293,6 +520,1724 @@ class Profile(db.Model):
     def __repr__(self):
         return f"Name: {self.first_name} {self.last_name}"
 
+# Query Helpers
+def co_member_ids_select(user_id):
+    """Select the ids of all users sharing at least one group with user_id (including user_id)"""
+    own_membership = db.aliased(GroupMember)
+    co_membership = db.aliased(GroupMember)
+    return (
+        db.select(co_membership.user_id)
+        .join(own_membership, own_membership.group_id == co_membership.group_id)
+        .where(own_membership.user_id == user_id)
+    )
+
+def experiment_access_condition(user_id):
+    """SQL condition: the experiment is owned by user_id or by someone sharing a group with them"""
+    own_membership = db.aliased(GroupMember)
+    co_membership = db.aliased(GroupMember)
+    # Correlated EXISTS on the experiment's owner, so a single-row lookup checks one owner
+    # against the membership index instead of materialising every co-member
+    shares_group = (
+        db.select(own_membership.id)
+        .join(co_membership, co_membership.group_id == own_membership.group_id)
+        .where(own_membership.user_id == user_id, co_membership.user_id == Experiment.owner_id)
+        .exists()
+    )
+    return or_(Experiment.owner_id == user_id, shares_group)
+
+def find_readable_experiment(exp_id, user_id, query=None):
+    """Experiment exp_id if user_id may read it (own or a co-member's), else None, in one query
+
+    Pass experiment_query() (or another Experiment query) to control what gets loaded.
+    """
+    query = Experiment.query if query is None else query
+    return query.filter(Experiment.exp_id == exp_id, experiment_access_condition(user_id)).first()
+
+def experiment_visibility(user_id, scope):
+    """SQL condition for the experiments user_id may list in the given scope ('user' or 'group')"""
+    if scope == 'group':
+        # Own experiments plus those of every co-member (cached per worker, see visible_owner_ids);
+        # the IN keeps each experiment row unique without Python dedup
+        return Experiment.owner_id.in_(visible_owner_ids(user_id))
+    # Only the user's own experiments
+    return Experiment.owner_id == user_id
+
+def group_summary_select():
+    """Select (Group, creator name, member count) rows, aggregated in one grouped query
+
+    Callers add their own filters; extra joined columns used for ordering must be added to group_by.
+    """
+    creator = db.aliased(User)
+    members = db.aliased(GroupMember)
+    return (
+        db.select(Group, creator.name, db.func.count(members.id))
+        .outerjoin(creator, creator.id == Group.created_by_id)
+        .outerjoin(members, members.group_id == Group.id)
+        .group_by(Group.id, creator.id)
+    )
+
+def group_summary(group_id):
+    """Group.to_dict() for group_id in one query, or None if it does not exist"""
+    row = db.session.execute(group_summary_select().where(Group.id == group_id)).first()
+    if row is None:
+        return None
+    group, creator_name, member_count = row
+    return group.to_dict(creator_name=creator_name, member_count=member_count)
+
+def experiment_load_options():
+    """Loader options for every relationship used by Experiment.to_dict()"""
+    # owner is many-to-one (cheap to join); logs/files are collections, loaded
+    # with one extra SELECT ... WHERE experiment_id IN (...) each
+    return (
+        joinedload(Experiment.owner_user),
+        selectinload(Experiment.logs),
+        selectinload(Experiment.files),
+    )
+
+def experiment_query():
+    """Experiment query that eagerly loads every relationship used by Experiment.to_dict()"""
+    return Experiment.query.options(*experiment_load_options())
+
+def experiment_summary_select():
+    """Column-only select of the experiment fields shown in list views"""
+    return (
+        db.select(
+            Experiment.exp_id,
+            Experiment.title,
+            Experiment.status,
+            Experiment.start_date,
+            Experiment.owner_id,
+            User.name.label('owner_name'),
+            # Not serialized; needed to build keyset cursors and ETags
+            Experiment.id,
+            Experiment.date_created,
+            Experiment.version,
+        )
+        .outerjoin(User, User.id == Experiment.owner_id)
+    )
+
+# Sort options for experiment listings: sort param -> (column, descending)
+# Every option is paired with Experiment.id as a tie-breaker so keyset cursors are unique
+EXPERIMENT_SORTS = {
+    '-dateCreated': (Experiment.date_created, True),
+    'dateCreated': (Experiment.date_created, False),
+    '-startDate': (Experiment.start_date, True),
+    'startDate': (Experiment.start_date, False),
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Cleanup jobs failing this many times are left for inspection instead of retried (blobs among
+# them are still deleted by `flask storage-gc`)
+STORAGE_CLEANUP_MAX_ATTEMPTS = 5
+# A failed cleanup job waits this long before its first retry, doubling after each further failure
+STORAGE_CLEANUP_RETRY_SECONDS = 60
+# Upper bound on log entries accepted by one batch ingestion request
+MAX_LOG_BATCH_SIZE = 1000
+# Rows fetched per server-side cursor batch (and emitted per chunk) when streaming exports
+EXPORT_BATCH_SIZE = 500
+# Most recently changed experiments listed by GET /api/stats
+RECENT_ACTIVITY_LIMIT = 5
+# Rows returned per kind (experiments, logs, files, deletions) by one incremental sync request
+DEFAULT_SYNC_BATCH_SIZE = 500
+MAX_SYNC_BATCH_SIZE = 2000
+# Sync cursors never move past now minus this margin: a transaction stamped earlier but
+# committed later is still picked up (clients may see recent changes twice)
+SYNC_CLOCK_MARGIN_SECONDS = 10
+SYNC_KINDS = ('experiments', 'logs', 'files', 'deleted')
+
+def encode_experiment_cursor(sort_value, pk):
+    """Encode the (sort key, id) of the last row on a page as an opaque cursor"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, pk]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_experiment_cursor(cursor, sort_column):
+    """Decode a cursor from encode_experiment_cursor(); returns None if it is malformed"""
+    try:
+        sort_value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if sort_column is Experiment.date_created:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif not isinstance(sort_value, str):
+            return None
+        if not isinstance(pk, int):
+            return None
+    except (ValueError, TypeError, UnicodeError):
+        return None
+    return sort_value, pk
+
+def encode_sync_cursor(positions, owner_ids):
+    """Encode the (modification time, id) reached for each sync kind, and the owners synced, as an opaque cursor"""
+    raw = {kind: [changed_at.isoformat(), pk] for kind, (changed_at, pk) in positions.items()}
+    raw['owners'] = sorted(owner_ids)
+    return base64.urlsafe_b64encode(json.dumps(raw).encode('utf-8')).decode('ascii')
+
+def decode_sync_cursor(cursor):
+    """Decode a cursor from encode_sync_cursor() into (positions, owner ids); returns None if it is malformed
+
+    Cursors issued before owners were recorded decode with owner ids None.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        positions = {kind: (datetime.fromisoformat(raw[kind][0]), raw[kind][1]) for kind in SYNC_KINDS}
+        if not all(isinstance(pk, int) for _, pk in positions.values()):
+            return None
+        owner_ids = raw.get('owners')
+        if owner_ids is not None:
+            if not isinstance(owner_ids, list) or not all(isinstance(owner_id, int) for owner_id in owner_ids):
+                return None
+            owner_ids = frozenset(owner_ids)
+    except (ValueError, TypeError, KeyError, IndexError, UnicodeError, AttributeError):
+        return None
+    return positions, owner_ids
+
+def keyset_condition(sort_column, descending, key, pk_column=None):
+    """Rows strictly after key in (sort_column, id) order"""
+    sort_value, pk = key
+    pk_column = Experiment.id if pk_column is None else pk_column
+    if descending:
+        return or_(sort_column < sort_value, and_(sort_column == sort_value, pk_column < pk))
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, pk_column > pk))
+
+def experiment_summary_dict(row):
+    """Serialize a row from experiment_summary_select() using the Experiment.to_dict() keys"""
+    return {
+        'id': row.exp_id,
+        'title': row.title,
+        'status': row.status,
+        'startDate': row.start_date,
+        'owner': row.owner_name or 'Unknown',
+        'ownerId': row.owner_id if row.owner_name is not None else None
+    }
+
+def experiment_change_summary(experiment, owner_name):
+    """experiment_summary_dict() of an experiment, carried by change events so subscribers
+    update their lists without fetching the experiment"""
+    return {
+        'id': experiment.exp_id,
+        'title': experiment.title,
+        'status': experiment.status,
+        'startDate': experiment.start_date,
+        'owner': owner_name,
+        'ownerId': experiment.owner_id
+    }
+
+def sync_experiment_logs(experiment_pk, logs):
+    """Make an experiment's logs match the given list, writing only the rows that differ
+
+    Entries carrying the id of a stored log update it in place if changed; entries
+    without an id are matched to an unchanged stored log with the same timestamp and
+    content, so clients that echo logs back without ids don't rewrite them. Unmatched
+    entries are bulk inserted and stored logs missing from the list are deleted.
+    Returns (inserted, updated, deleted) counts.
+    """
+    existing = {
+        row.id: row
+        for row in db.session.execute(
+            db.select(ExperimentLog.id, ExperimentLog.timestamp, ExperimentLog.content)
+            .where(ExperimentLog.experiment_id == experiment_pk)
+        )
+    }
+    unclaimed_by_value = {}
+    for row in existing.values():
+        unclaimed_by_value.setdefault((row.timestamp, row.content), []).append(row.id)
+    
+    kept_ids = set()
+    updates = []
+    pending = []
+    for log_data in logs:
+        log_id = log_data.get('id')
+        if log_id in existing and log_id not in kept_ids:
+            kept_ids.add(log_id)
+            stored = existing[log_id]
+            if (stored.timestamp, stored.content) != (log_data['timestamp'], log_data['content']):
+                updates.append({'id': log_id, 'timestamp': log_data['timestamp'], 'content': log_data['content']})
+        else:
+            pending.append(log_data)
+    
+    inserts = []
+    for log_data in pending:
+        candidates = unclaimed_by_value.get((log_data['timestamp'], log_data['content']), [])
+        while candidates and candidates[-1] in kept_ids:
+            candidates.pop()
+        if candidates:
+            kept_ids.add(candidates.pop())
+        else:
+            inserts.append({
+                'experiment_id': experiment_pk,
+                'timestamp': log_data['timestamp'],
+                'content': log_data['content']
+            })
+    
+    removed_ids = [log_id for log_id in existing if log_id not in kept_ids]
+    if removed_ids:
+        record_tombstones('log', ExperimentLog, removed_ids)
+        db.session.execute(db.delete(ExperimentLog).where(ExperimentLog.id.in_(removed_ids)))
+    if updates:
+        # Bulk UPDATE by primary key (executemany)
+        db.session.execute(db.update(ExperimentLog), updates)
+    if inserts:
+        # Bulk INSERT (executemany) instead of one ORM object per row
+        db.session.execute(db.insert(ExperimentLog), inserts)
+    return len(inserts), len(updates), len(removed_ids)
+
+def record_tombstones(kind, model, record_ids):
+    """Record deletion of the ExperimentLog/ExperimentFile rows record_ids; call before deleting them"""
+    db.session.execute(
+        db.insert(Tombstone).from_select(
+            ['kind', 'record_id', 'exp_id', 'owner_id', 'date_deleted'],
+            db.select(db.literal(kind), model.id, Experiment.exp_id, Experiment.owner_id, db.literal(datetime.now()))
+            .join(Experiment, Experiment.id == model.experiment_id)
+            .where(model.id.in_(record_ids))
+        )
+    )
+
+def readable_owner_sets(user_ids):
+    """Map each of user_ids to the owner ids whose experiments they can read, read from the database"""
+    own_membership = db.aliased(GroupMember)
+    co_membership = db.aliased(GroupMember)
+    owner_sets = {user_id: {user_id} for user_id in user_ids}
+    rows = db.session.execute(
+        db.select(own_membership.user_id, co_membership.user_id)
+        .join(co_membership, co_membership.group_id == own_membership.group_id)
+        .where(own_membership.user_id.in_(owner_sets))
+    )
+    for user_id, owner_id in rows:
+        owner_sets[user_id].add(owner_id)
+    return owner_sets
+
+def record_visibility_changes(before, after):
+    """Tombstone experiments users can no longer read after a membership change
+
+    before and after come from readable_owner_sets() around the change. Each user losing an owner
+    gets a viewer tombstone for every experiment of that owner (and for that owner's recent
+    deletions, which the sync stops reporting to them). Viewer tombstones for owners that became
+    readable again are dropped; sync cursors re-send everything when their owners gain one.
+    """
+    now = datetime.now()
+    for viewer_id, owner_ids in before.items():
+        lost = owner_ids - after[viewer_id]
+        gained = after[viewer_id] - owner_ids
+        if gained:
+            db.session.execute(
+                db.delete(Tombstone).where(Tombstone.viewer_id == viewer_id, Tombstone.owner_id.in_(gained))
+            )
+        if lost:
+            columns = (db.literal('experiment'), db.literal(viewer_id), db.literal(now))
+            db.session.execute(
+                db.insert(Tombstone).from_select(
+                    ['kind', 'viewer_id', 'date_deleted', 'record_id', 'exp_id', 'owner_id'],
+                    db.union_all(
+                        db.select(*columns, Experiment.id, Experiment.exp_id, Experiment.owner_id)
+                        .where(Experiment.owner_id.in_(lost)),
+                        db.select(*columns, Tombstone.record_id, Tombstone.exp_id, Tombstone.owner_id)
+                        .where(Tombstone.kind == 'experiment', Tombstone.viewer_id.is_(None), Tombstone.owner_id.in_(lost)),
+                    )
+                )
+            )
+
+def bump_experiment_version(experiment_pk):
+    """Atomically increment an experiment's version within the current transaction; returns the new value"""
+    return db.session.scalar(
+        db.update(Experiment)
+        .where(Experiment.id == experiment_pk)
+        .values(version=Experiment.version + 1)
+        .returning(Experiment.version)
+    )
+
+def wants_slim_response(default=False):
+    """Whether a write should answer with only the changed entity instead of the full experiment
+
+    Clients opt in with ?response=slim or 'Prefer: return=minimal', and opt out with
+    ?response=full or 'Prefer: return=representation'.
+    """
+    mode = request.args.get('response')
+    if mode in ('slim', 'full'):
+        return mode == 'slim'
+    prefer = request.headers.get('Prefer', '')
+    if 'return=minimal' in prefer:
+        return True
+    if 'return=representation' in prefer:
+        return False
+    return default
+
+def bump_group_versions(group_ids):
+    """Increment the version of each group in group_ids within the current transaction"""
+    if group_ids:
+        db.session.execute(
+            db.update(Group)
+            .where(Group.id.in_(group_ids))
+            .values(version=Group.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+def experiment_etag(exp_id, version):
+    """ETag of an experiment's representation at the given version"""
+    return f'{exp_id}-v{version}'
+
+def versioned_response(payload, exp_id, version, status_code):
+    """JSON response carrying the experiment version as its ETag"""
+    response = jsonify(payload)
+    response.status_code = status_code
+    response.set_etag(experiment_etag(exp_id, version))
+    return response
+
+def with_validator(response, etag):
+    """Attach etag to a per-user read response and make clients revalidate it before reuse"""
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def not_modified(etag):
+    """304 response if the request's If-None-Match already holds etag, else None
+
+    Read routes compute the etag from version counters first and skip building the payload on a match.
+    """
+    if etag not in request.if_none_match:
+        return None
+    return with_validator(Response(status=304), etag)
+
+def digest_etag(prefix, *parts):
+    """Compact ETag derived from arbitrary validator values"""
+    return f'{prefix}-' + hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:20]
+
+def get_owned_upload_session(exp_id, upload_id, user_id):
+    """Upload session belonging to user_id on experiment exp_id, or None"""
+    return (
+        UploadSession.query
+        .join(Experiment, Experiment.id == UploadSession.experiment_id)
+        .filter(UploadSession.id == upload_id, UploadSession.user_id == user_id, Experiment.exp_id == exp_id)
+        .first()
+    )
+
+def reload_experiment(experiment):
+    """Reload an experiment expired by commit so to_dict() runs in a bounded number of queries"""
+    # Read the primary key from the identity map; touching experiment.id would trigger a refresh
+    experiment_pk = inspect(experiment).identity[0]
+    return experiment_query().populate_existing().filter(Experiment.id == experiment_pk).first()
+
+# Authorization Context Cache
+# The session user and the set of owners whose experiments they may read are resolved once per
+# request (flask.g) and kept for AUTH_CACHE_TTL seconds per worker. Routes that change a user or
+# a group's membership invalidate the affected entries; other workers catch up within the TTL.
+class TTLCache:
+    """Small thread-safe mapping whose entries expire ttl seconds after being stored"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+user_snapshot_cache = TTLCache(app.config['AUTH_CACHE_TTL'])
+visible_owner_cache = TTLCache(app.config['AUTH_CACHE_TTL'])
+
+def current_user():
+    """User row for the session user, loaded at most once per request (None if missing)"""
+    if 'current_user' not in g:
+        user_id = session.get('user_id')
+        g.current_user = db.session.get(User, user_id) if user_id else None
+    return g.current_user
+
+def get_user_snapshot(user_id):
+    """User.to_dict() for user_id, served from the process cache when fresh (None if missing)"""
+    snapshot = user_snapshot_cache.get(user_id)
+    if snapshot is None:
+        user = current_user() if user_id == session.get('user_id') else db.session.get(User, user_id)
+        if user is None:
+            return None
+        snapshot = user.to_dict()
+        user_snapshot_cache.set(user_id, snapshot)
+    return snapshot
+
+def visible_owner_ids(user_id):
+    """Frozenset of owner ids whose experiments user_id may read: themselves plus every co-member"""
+    cached = g.setdefault('visible_owner_ids', {})
+    if user_id not in cached:
+        # With a shared result cache the membership generation tells this worker about
+        # membership changes made on other workers before AUTH_CACHE_TTL runs out
+        generation = result_cache.generation(f'membership:{user_id}')
+        entry = visible_owner_cache.get(user_id)
+        if entry is None or entry[0] != generation:
+            entry = (generation, frozenset(db.session.scalars(co_member_ids_select(user_id))) | {user_id})
+            visible_owner_cache.set(user_id, entry)
+        cached[user_id] = entry[1]
+    return cached[user_id]
+
+def invalidate_user_cache(user_id):
+    """Forget the cached profile of user_id (call after changing the user row)"""
+    user_snapshot_cache.invalidate([user_id])
+
+def invalidate_group_visibility(group_id, *user_ids):
+    """Forget cached visibility for every member of group_id and for user_ids
+
+    Call after committing a membership change (so no request re-caches the old state):
+    joining or leaving a group changes what every other member can see, not just the user.
+    """
+    member_ids = set(db.session.scalars(db.select(GroupMember.user_id).where(GroupMember.group_id == group_id)))
+    member_ids.update(user_ids)
+    visible_owner_cache.invalidate(member_ids)
+    g.pop('visible_owner_ids', None)
+    # Group listings show member counts; group-scope experiment listings follow membership
+    result_cache.bump_generations(
+        [f'groups:{member_id}' for member_id in member_ids] +
+        [f'visible:{member_id}' for member_id in member_ids] +
+        [f'membership:{member_id}' for member_id in member_ids]
+    )
+
+# Result Cache
+# Serialized GET /api/experiments and GET /api/groups responses, stored with their ETag. Each key
+# embeds a generation counter for the listing it belongs to ('own:<user>', 'visible:<user>' or
+# 'groups:<user>'); mutating routes bump the affected generations after commit, so stale entries
+# are never read again and simply age out.
+class MemoryResultCache:
+    """Per-process LRU cache bounded by the total size of stored values"""
+    name = 'memory'
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._generations = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        if self.ttl <= 0 or len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def generation(self, name):
+        # Generations are never evicted: resetting one could resurrect entries stored under it
+        with self._lock:
+            return self._generations.get(name, 0)
+
+    def bump_generations(self, names):
+        with self._lock:
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.name, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(self._entries), 'bytes': self._size,
+            }
+
+class RedisResultCache:
+    """Cache shared by every worker and instance through Redis (or any server speaking its protocol)
+
+    Redis errors are treated as misses so an unavailable cache only costs the database queries.
+    """
+    name = 'redis'
+    KEY_PREFIX = 'lab-tracker:'
+
+    def __init__(self, url, ttl):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESULT_CACHE_BACKEND=redis requires redis (pip install redis)")
+        self.client = redis.Redis.from_url(url)
+        self.errors = (redis.RedisError,)
+        self.ttl = ttl
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        try:
+            value = self.client.get(self.KEY_PREFIX + key)
+        except self.errors as e:
+            print(f"Warning: result cache read failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        try:
+            self.client.set(self.KEY_PREFIX + key, value, ex=self.ttl)
+        except self.errors as e:
+            print(f"Warning: result cache write failed: {e}")
+
+    def generation(self, name):
+        try:
+            return int(self.client.get(f'{self.KEY_PREFIX}gen:{name}') or 0)
+        except self.errors as e:
+            print(f"Warning: result cache read failed: {e}")
+            return None
+
+    def bump_generations(self, names):
+        if not names:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for name in names:
+                pipeline.incr(f'{self.KEY_PREFIX}gen:{name}')
+            pipeline.execute()
+        except self.errors as e:
+            # Entries already cached for these listings stay visible until RESULT_CACHE_TTL
+            print(f"Warning: result cache invalidation failed: {e}")
+
+    def stats(self):
+        return {'backend': self.name, 'hits': self.hits, 'misses': self.misses}
+
+class NullResultCache:
+    """Result caching disabled"""
+    name = 'none'
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def generation(self, name):
+        return None
+
+    def bump_generations(self, names):
+        pass
+
+    def stats(self):
+        return {'backend': self.name}
+
+def create_result_cache():
+    """Result cache selected by RESULT_CACHE_BACKEND"""
+    backend = app.config['RESULT_CACHE_BACKEND']
+    if backend == 'redis':
+        return RedisResultCache(app.config['RESULT_CACHE_REDIS_URL'], app.config['RESULT_CACHE_TTL'])
+    if backend == 'memory':
+        return MemoryResultCache(app.config['RESULT_CACHE_MAX_BYTES'], app.config['RESULT_CACHE_TTL'])
+    return NullResultCache()
+
+with startup_profile.phase('result cache'):
+    result_cache = create_result_cache()
+
+def result_cache_key(generation_name, *parts):
+    """Cache key for a listing under its current generation, or None if the cache is unavailable"""
+    generation = result_cache.generation(generation_name)
+    if generation is None:
+        return None
+    return digest_etag(f'{generation_name}:{generation}', *parts)
+
+def cached_result(key):
+    """Response for a cached listing (304 if the client already has it), or None on a miss"""
+    value = result_cache.get(key) if key else None
+    if value is None:
+        return None
+    etag, _, body = value.partition(b'\n')
+    etag = etag.decode('ascii')
+    response = not_modified(etag) or Response(body, mimetype='application/json')
+    response.headers['X-Cache'] = 'HIT'
+    return with_validator(response, etag)
+
+def store_result(key, response, etag):
+    """Cache a listing response under key and return it"""
+    if key:
+        result_cache.set(key, etag.encode('ascii') + b'\n' + response.get_data())
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+def invalidate_experiment_results(owner_id):
+    """Drop cached listings containing owner_id's experiments (call after committing a change)"""
+    viewer_ids = set(db.session.scalars(co_member_ids_select(owner_id)))
+    viewer_ids.add(owner_id)
+    result_cache.bump_generations([f'own:{owner_id}'] + [f'visible:{viewer_id}' for viewer_id in viewer_ids])
+
+def invalidate_group_results(group_ids):
+    """Drop cached group listings of every member of group_ids (call after committing a change)"""
+    if not group_ids:
+        return
+    member_ids = set(db.session.scalars(db.select(GroupMember.user_id).where(GroupMember.group_id.in_(group_ids))))
+    result_cache.bump_generations([f'groups:{member_id}' for member_id in member_ids])
+
+# Storage Backends
+# Blob data and in-progress upload sessions live behind a small interface so instances can
+# share an object store instead of a disk. Keys are '/'-separated paths relative to the
+# storage root (blobs/<aa>/<sha256>, or the uuid name of files saved before the blob store).
+class LocalStorage:
+    """Files under UPLOAD_FOLDER on the local filesystem"""
+    name = 'local'
+    
+    def __init__(self, root):
+        self.root = root
+    
+    def path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+    
+    def locate(self, key):
+        """Human-readable location recorded in ExperimentFile.file_path"""
+        return self.path(key)
+    
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+    
+    def put_file(self, key, local_path):
+        """Store a finished local file under key, consuming local_path"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(local_path, path)
+    
+    def open(self, key):
+        return open(self.path(key), 'rb')
+    
+    def delete(self, key):
+        if os.path.exists(self.path(key)):
+            os.remove(self.path(key))
+    
+    def list_keys(self):
+        """Yield (key, last modified epoch seconds) for everything stored"""
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                key = os.path.relpath(path, self.root).replace(os.sep, '/')
+                yield key, os.path.getmtime(path)
+    
+    def download_response(self, key, experiment_file):
+        # conditional=True makes Werkzeug answer Range/If-Range with 206 partial content and
+        # If-None-Match/If-Modified-Since with 304; the file body goes through wsgi.file_wrapper
+        # (sendfile under gunicorn) or X-Sendfile when USE_X_SENDFILE is on
+        response = send_from_directory(
+            self.root,
+            key,
+            as_attachment=True,
+            download_name=experiment_file.original_filename,
+            # Blob names carry no extension to guess from
+            mimetype=experiment_file.mime_type,
+            conditional=True,
+            # Strong ETag from the stored SHA-256; older files without one fall back to mtime/size
+            etag=experiment_file.content_hash or True,
+            last_modified=experiment_file.date_created
+        )
+        # Advertise resumability on full responses too (Werkzeug only sets it when answering a Range)
+        response.accept_ranges = 'bytes'
+        return response
+    
+    # Resumable upload sessions: one growing file per session
+    def partial_key(self, upload_id):
+        return f'partial/{upload_id}.part'
+    
+    def create_partial(self, upload_id):
+        path = self.path(self.partial_key(upload_id))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'wb').close()
+    
+    def partial_size(self, upload_id):
+        """Bytes stored so far, or None if the partial data is gone"""
+        path = self.path(self.partial_key(upload_id))
+        return os.path.getsize(path) if os.path.exists(path) else None
+    
+    def append_partial(self, upload_id, offset, stream, hasher):
+        return write_stream(stream, self.path(self.partial_key(upload_id)), hasher, mode='ab')
+    
+    def truncate_partial(self, upload_id, size):
+        with open(self.path(self.partial_key(upload_id)), 'ab') as partial:
+            partial.truncate(size)
+    
+    def read_partial(self, upload_id):
+        with open(self.path(self.partial_key(upload_id)), 'rb') as partial:
+            yield from iter(lambda: partial.read(app.config['UPLOAD_CHUNK_SIZE']), b'')
+    
+    def promote_partial(self, upload_id, key):
+        """Turn a completed session's data into the object at key"""
+        self.put_file(key, self.path(self.partial_key(upload_id)))
+    
+    def delete_partial(self, upload_id):
+        self.delete(self.partial_key(upload_id))
+
+class S3Storage:
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, GCS interoperability)"""
+    name = 's3'
+    # S3 multipart parts must be at least 5 MiB, except the last one
+    MIN_PART_SIZE = 5 * 1024 * 1024
+    
+    def __init__(self, bucket, prefix='', endpoint_url=None, region=None, presign_expires=300):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+        self.client = boto3.client('s3', endpoint_url=endpoint_url or None, region_name=region or None)
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix.strip('/') else ''
+        self.presign_expires = presign_expires
+    
+    def object_key(self, key):
+        return f'{self.prefix}{key}'
+    
+    def locate(self, key):
+        return f's3://{self.bucket}/{self.object_key(key)}'
+    
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+    
+    def put_file(self, key, local_path):
+        # upload_file switches to a parallel multipart upload for large files
+        self.client.upload_file(local_path, self.bucket, self.object_key(key))
+        os.remove(local_path)
+    
+    def open(self, key):
+        return self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))['Body']
+    
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+    
+    def list_keys(self):
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get('Contents', []):
+                yield obj['Key'][len(self.prefix):], obj['LastModified'].timestamp()
+    
+    def download_response(self, key, experiment_file):
+        # The client fetches straight from the object store, which handles Range itself
+        url = self.client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': self.bucket,
+                'Key': self.object_key(key),
+                'ResponseContentDisposition': f'attachment; filename="{experiment_file.original_filename}"',
+                'ResponseContentType': experiment_file.mime_type or 'application/octet-stream',
+            },
+            ExpiresIn=self.presign_expires
+        )
+        return redirect(url, code=302)
+    
+    # Resumable upload sessions: one object per chunk, named by its zero-padded offset
+    def partial_prefix(self, upload_id):
+        return self.object_key(f'partial/{upload_id}/')
+    
+    def partial_chunks(self, upload_id):
+        """[(offset, object key, size)] of a session's chunks, in order"""
+        chunks = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.partial_prefix(upload_id)):
+            for obj in page.get('Contents', []):
+                chunks.append((int(obj['Key'].rsplit('/', 1)[1]), obj['Key'], obj['Size']))
+        return sorted(chunks)
+    
+    def create_partial(self, upload_id):
+        # Nothing to allocate until the first chunk arrives
+        pass
+    
+    def partial_size(self, upload_id):
+        return sum(size for _, _, size in self.partial_chunks(upload_id))
+    
+    def append_partial(self, upload_id, offset, stream, hasher):
+        reader = HashingReader(stream, hasher)
+        self.client.upload_fileobj(reader, self.bucket, f'{self.partial_prefix(upload_id)}{offset:020d}')
+        return reader.bytes_read
+    
+    def truncate_partial(self, upload_id, size):
+        # Chunks are written whole, so anything starting at or past size is an unrecorded retry
+        for offset, object_key, _ in self.partial_chunks(upload_id):
+            if offset >= size:
+                self.client.delete_object(Bucket=self.bucket, Key=object_key)
+    
+    def read_partial(self, upload_id):
+        for _, object_key, _ in self.partial_chunks(upload_id):
+            body = self.client.get_object(Bucket=self.bucket, Key=object_key)['Body']
+            yield from body.iter_chunks(app.config['UPLOAD_CHUNK_SIZE'])
+    
+    def promote_partial(self, upload_id, key):
+        chunks = self.partial_chunks(upload_id)
+        target = self.object_key(key)
+        if len(chunks) == 1 or any(size < self.MIN_PART_SIZE for _, _, size in chunks[:-1]):
+            # Parts too small for server-side assembly: stream them through once
+            self.client.upload_fileobj(ChainedReader(self.read_partial(upload_id)), self.bucket, target)
+        else:
+            # Assemble server-side with UploadPartCopy, no bytes pass through this instance
+            multipart = self.client.create_multipart_upload(Bucket=self.bucket, Key=target)
+            parts = []
+            for number, (_, object_key, _) in enumerate(chunks, start=1):
+                result = self.client.upload_part_copy(
+                    Bucket=self.bucket, Key=target, UploadId=multipart['UploadId'], PartNumber=number,
+                    CopySource={'Bucket': self.bucket, 'Key': object_key}
+                )
+                parts.append({'PartNumber': number, 'ETag': result['CopyPartResult']['ETag']})
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=target, UploadId=multipart['UploadId'], MultipartUpload={'Parts': parts}
+            )
+        self.delete_partial(upload_id)
+    
+    def delete_partial(self, upload_id):
+        for _, object_key, _ in self.partial_chunks(upload_id):
+            self.client.delete_object(Bucket=self.bucket, Key=object_key)
+
+class HashingReader:
+    """File-like wrapper that hashes and counts everything read through it"""
+    def __init__(self, stream, hasher):
+        self.stream = stream
+        self.hasher = hasher
+        self.bytes_read = 0
+    
+    def read(self, size=-1):
+        chunk = self.stream.read(size)
+        self.hasher.update(chunk)
+        self.bytes_read += len(chunk)
+        return chunk
+
+class ChainedReader:
+    """File-like reader over an iterator of byte chunks"""
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = b''
+    
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        if size < 0:
+            data, self.buffer = self.buffer, b''
+        else:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+def create_storage():
+    """Storage backend selected by STORAGE_BACKEND"""
+    if app.config['STORAGE_BACKEND'] == 's3':
+        return S3Storage(
+            bucket=app.config['S3_BUCKET'],
+            prefix=app.config['S3_PREFIX'],
+            endpoint_url=app.config['S3_ENDPOINT_URL'],
+            region=app.config['S3_REGION'],
+            presign_expires=app.config['S3_PRESIGN_EXPIRES']
+        )
+    return LocalStorage(app.config['UPLOAD_FOLDER'])
+
+with startup_profile.phase('storage backend'):
+    storage = create_storage()
+
+# File Storage Helpers
+# In-process SHA-256 state per upload session, so each chunk is hashed exactly once.
+# A session resumed on another worker (or after a restart) re-hashes its stored data once.
+upload_hashers = {}
+upload_hashers_lock = threading.Lock()
+
+def write_stream(stream, path, hasher, mode='wb'):
+    """Copy a stream to path in UPLOAD_CHUNK_SIZE blocks, updating hasher; returns bytes written"""
+    chunk_size = app.config['UPLOAD_CHUNK_SIZE']
+    written = 0
+    with open(path, mode) as out:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            out.write(chunk)
+            written += len(chunk)
+    return written
+
+def upload_session_hasher(upload_id):
+    """Running SHA-256 for an upload session, rebuilt from stored data if this process lost it"""
+    with upload_hashers_lock:
+        hasher = upload_hashers.get(upload_id)
+        if hasher is None:
+            hasher = hashlib.sha256()
+            for chunk in storage.read_partial(upload_id):
+                hasher.update(chunk)
+            upload_hashers[upload_id] = hasher
+        return hasher
+
+def discard_partial_tail(upload_id, size):
+    """Truncate a partial upload back to size bytes so the chunk after them can be retried"""
+    storage.truncate_partial(upload_id, size)
+    # The running hash already includes the discarded bytes; rebuild it on next use
+    with upload_hashers_lock:
+        upload_hashers.pop(upload_id, None)
+
+def claim_upload_range(upload_id, start, length):
+    """Advance an upload session's offset from start to start + length if it is still at start
+
+    Commits immediately and returns whether this request won the range: of two requests for the
+    same chunk (a client retry racing the original) only one may append it.
+    """
+    claimed = db.session.execute(
+        db.update(UploadSession)
+        .where(UploadSession.id == upload_id, UploadSession.status == 'open', UploadSession.bytes_received == start)
+        .values(bytes_received=start + length)
+    ).rowcount
+    db.session.commit()
+    return claimed == 1
+
+def release_upload_range(upload_id, start, length):
+    """Undo claim_upload_range() for a chunk that was not stored"""
+    db.session.execute(
+        db.update(UploadSession)
+        .where(UploadSession.id == upload_id, UploadSession.bytes_received == start + length)
+        .values(bytes_received=start)
+    )
+    db.session.commit()
+
+def claim_upload_completion(upload_id, size):
+    """Mark an open upload session of size bytes as completing
+
+    Commits immediately and returns whether this request won the session: of two concurrent
+    complete requests only one may turn it into a file, and no chunk is accepted after that.
+    """
+    claimed = db.session.execute(
+        db.update(UploadSession)
+        .where(UploadSession.id == upload_id, UploadSession.status == 'open', UploadSession.bytes_received == size)
+        .values(status='completing')
+    ).rowcount
+    db.session.commit()
+    return claimed == 1
+
+def release_upload_completion(upload_id):
+    """Undo claim_upload_completion() for a session that was not turned into a file"""
+    db.session.execute(
+        db.update(UploadSession)
+        .where(UploadSession.id == upload_id, UploadSession.status == 'completing')
+        .values(status='open')
+    )
+    db.session.commit()
+
+def new_temp_path():
+    """Fresh local scratch path for an upload whose content hash is not known yet"""
+    path = os.path.join(app.config['UPLOAD_FOLDER'], 'tmp', str(uuid.uuid4()))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def blob_key(content_hash):
+    """Storage key of a blob (also stored as ExperimentFile.filename)"""
+    return f'blobs/{content_hash[:2]}/{content_hash}'
+
+def is_blob_backed(experiment_file):
+    """Files saved before the blob store have their own uuid-named copy instead"""
+    return bool(experiment_file.content_hash) and experiment_file.filename == blob_key(experiment_file.content_hash)
+
+def acquire_blob_reference(content_hash):
+    """Add a reference to an existing blob; returns False if no blob with that hash exists"""
+    return db.session.scalar(
+        db.update(FileBlob)
+        .where(FileBlob.content_hash == content_hash)
+        .values(ref_count=FileBlob.ref_count + 1)
+        .returning(FileBlob.ref_count)
+    ) is not None
+
+def claim_blob(content_hash, file_size):
+    """Take a reference on the blob for content_hash inside the caller's transaction
+
+    Returns True when the caller must write the content to storage (new content, or a
+    blob row whose data went missing) and False when identical data is already stored.
+    """
+    existing = acquire_blob_reference(content_hash)
+    if not existing:
+        try:
+            with db.session.begin_nested():
+                db.session.add(FileBlob(content_hash=content_hash, file_size=file_size, ref_count=1))
+        except IntegrityError:
+            # The same content was stored concurrently by another request
+            existing = acquire_blob_reference(content_hash)
+    return not (existing and storage.exists(blob_key(content_hash)))
+
+def release_blob_reference(content_hash):
+    """Drop a reference inside the caller's transaction, queueing cleanup when it was the last one"""
+    remaining = db.session.scalar(
+        db.update(FileBlob)
+        .where(FileBlob.content_hash == content_hash)
+        .values(ref_count=FileBlob.ref_count - 1)
+        .returning(FileBlob.ref_count)
+    )
+    if remaining is not None and remaining <= 0:
+        enqueue_storage_cleanup('blob', [content_hash])
+
+def release_experiment_files(experiment_pk):
+    """Release every file of an experiment with set-based SQL, queueing storage cleanup"""
+    blob_backed = and_(ExperimentFile.experiment_id == experiment_pk, ExperimentFile.filename.like('blobs/%'))
+    # One decrement per blob, by the number of this experiment's files that reference it
+    held = (
+        db.select(db.func.count(ExperimentFile.id))
+        .where(blob_backed, ExperimentFile.content_hash == FileBlob.content_hash)
+        .scalar_subquery()
+    )
+    released = db.session.execute(
+        db.update(FileBlob)
+        .where(FileBlob.content_hash.in_(db.select(ExperimentFile.content_hash).where(blob_backed)))
+        .values(ref_count=FileBlob.ref_count - held)
+        .returning(FileBlob.content_hash, FileBlob.ref_count)
+        .execution_options(synchronize_session=False)
+    ).all()
+    enqueue_storage_cleanup('blob', [row.content_hash for row in released if row.ref_count <= 0])
+    # Files saved before the blob store own their data outright
+    enqueue_storage_cleanup('key', db.session.scalars(
+        db.select(ExperimentFile.filename)
+        .where(ExperimentFile.experiment_id == experiment_pk, ExperimentFile.filename.not_like('blobs/%'))
+    ).all())
+    enqueue_storage_cleanup('partial', db.session.scalars(
+        db.select(UploadSession.id).where(UploadSession.experiment_id == experiment_pk)
+    ).all())
+
+# Background Storage Cleanup
+# Deleting data is queued in storage_cleanup_job within the request's transaction and done by a
+# background thread after commit; jobs left behind by a crash are retried on the next run or by
+# `flask storage-gc`.
+storage_cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='storage-cleanup')
+
+def enqueue_storage_cleanup(kind, targets):
+    """Queue cleanup jobs ('blob' content hashes, 'key' storage keys, 'partial' upload ids)"""
+    if targets:
+        db.session.execute(db.insert(StorageCleanupJob), [{'kind': kind, 'target': target} for target in targets])
+
+def schedule_storage_cleanup():
+    """Run pending cleanup jobs on the background thread; call after committing"""
+    def run():
+        with app.app_context():
+            run_storage_cleanup()
+    return storage_cleanup_executor.submit(run)
+
+def delete_unreferenced_blob(content_hash):
+    """Delete a blob's row and stored data if nothing references it; the caller commits
+
+    The row is deleted only at ref_count 0, and the data goes before commit while the row is
+    locked, so a concurrent upload of the same content waits and then writes a fresh copy
+    instead of losing it.
+    """
+    deleted = db.session.execute(
+        db.delete(FileBlob).where(FileBlob.content_hash == content_hash, FileBlob.ref_count <= 0)
+    ).rowcount
+    if deleted:
+        storage.delete(blob_key(content_hash))
+    return bool(deleted)
+
+def run_storage_cleanup(batch_size=100):
+    """Process due cleanup jobs until none are left; returns the number completed
+
+    A failing job is retried after STORAGE_CLEANUP_RETRY_SECONDS, doubling each time, and never
+    again within the same run, so a transient storage error does not use up its attempts at once.
+    """
+    completed = 0
+    failed_ids = set()
+    while True:
+        jobs = (
+            StorageCleanupJob.query
+            .filter(
+                StorageCleanupJob.attempts < STORAGE_CLEANUP_MAX_ATTEMPTS,
+                or_(StorageCleanupJob.next_attempt_at.is_(None), StorageCleanupJob.next_attempt_at <= datetime.now()),
+                StorageCleanupJob.id.notin_(failed_ids)
+            )
+            .order_by(StorageCleanupJob.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not jobs:
+            return completed
+        for job in jobs:
+            job_id, kind, target, attempts = job.id, job.kind, job.target, job.attempts
+            try:
+                if kind == 'blob':
+                    delete_unreferenced_blob(target)
+                elif kind == 'key':
+                    storage.delete(target)
+                elif kind == 'partial':
+                    storage.delete_partial(target)
+                db.session.execute(db.delete(StorageCleanupJob).where(StorageCleanupJob.id == job_id))
+                db.session.commit()
+                completed += 1
+            except Exception as e:
+                db.session.rollback()
+                failed_ids.add(job_id)
+                db.session.execute(
+                    db.update(StorageCleanupJob)
+                    .where(StorageCleanupJob.id == job_id)
+                    .values(
+                        attempts=StorageCleanupJob.attempts + 1,
+                        last_error=str(e)[:500],
+                        next_attempt_at=datetime.now() + timedelta(seconds=STORAGE_CLEANUP_RETRY_SECONDS * 2 ** attempts)
+                    )
+                )
+                db.session.commit()
+                print(f"Warning: storage cleanup job {job_id} ({kind} {target}) failed: {e}")
+
+def collect_abandoned_blobs():
+    """Delete unreferenced blobs no cleanup job will retry any more; returns the keys removed
+
+    A blob whose cleanup job ran out of attempts keeps its row at ref_count 0, so the orphan
+    scan would skip it forever; this deletes it the way the job would have.
+    """
+    retrying = db.select(StorageCleanupJob.id).where(
+        StorageCleanupJob.kind == 'blob',
+        StorageCleanupJob.target == FileBlob.content_hash,
+        StorageCleanupJob.attempts < STORAGE_CLEANUP_MAX_ATTEMPTS
+    )
+    content_hashes = db.session.scalars(
+        db.select(FileBlob.content_hash).where(FileBlob.ref_count <= 0, ~retrying.exists())
+    ).all()
+    removed = []
+    for content_hash in content_hashes:
+        try:
+            if delete_unreferenced_blob(content_hash):
+                removed.append(blob_key(content_hash))
+            db.session.execute(
+                db.delete(StorageCleanupJob).where(StorageCleanupJob.kind == 'blob', StorageCleanupJob.target == content_hash)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Warning: could not delete abandoned blob {content_hash}: {e}")
+    return removed
+
+# Stored keys the app creates; anything else under the storage root is not ours to delete
+STORAGE_UUID_PATTERN = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+BLOB_KEY_RE = re.compile(r'blobs/[0-9a-f]{2}/([0-9a-f]{64})')
+PARTIAL_KEY_RE = re.compile(rf'partial/({STORAGE_UUID_PATTERN})(?:\.part|/\d+)')  # Local file or S3 chunk
+TEMP_KEY_RE = re.compile(rf'tmp/{STORAGE_UUID_PATTERN}')
+LEGACY_FILE_KEY_RE = re.compile(rf'{STORAGE_UUID_PATTERN}(?:\.[A-Za-z0-9_-]+)?')  # Pre-blob uploads: <uuid><ext>
+
+def collect_orphaned_files(grace_seconds):
+    """Delete stored data no database row refers to; returns the keys removed
+
+    Anything modified within grace_seconds is skipped so in-flight uploads, whose data is
+    written before their rows commit, are left alone. Only keys matching the app's own naming
+    are considered, and a bucket without S3_PREFIX is refused since it may hold other data.
+    """
+    if storage.name == 's3' and not storage.prefix:
+        raise RuntimeError("storage-gc needs S3_PREFIX set so it only scans this app's objects")
+    cutoff = time.time() - grace_seconds
+    referenced = set(db.session.scalars(db.select(ExperimentFile.filename)))
+    # Blobs at ref_count 0 are left to their queued cleanup job, which deletes them safely
+    known_blobs = set(db.session.scalars(db.select(FileBlob.content_hash)))
+    live_sessions = set(db.session.scalars(db.select(UploadSession.id)))
+    removed = []
+    for key, modified in list(storage.list_keys()):
+        if modified > cutoff:
+            continue
+        blob_match = BLOB_KEY_RE.fullmatch(key)
+        partial_match = PARTIAL_KEY_RE.fullmatch(key)
+        if blob_match:
+            orphaned = blob_match.group(1) not in known_blobs and key not in referenced
+        elif partial_match:
+            orphaned = partial_match.group(1) not in live_sessions
+        elif TEMP_KEY_RE.fullmatch(key):
+            orphaned = True
+        elif LEGACY_FILE_KEY_RE.fullmatch(key):
+            orphaned = key not in referenced
+        else:
+            orphaned = False
+        if orphaned:
+            storage.delete(key)
+            removed.append(key)
+    return removed
+
+# Change Feed
+# Mutating routes record events in the change_event outbox inside their transaction, with the
+# users allowed to see them. One poller thread per worker delivers new rows to that worker's
+# open streams: it is woken right after a local commit and otherwise polls every
+# CHANGE_FEED_POLL_SECONDS, so events written by other workers fan out as well.
+CHANGE_FEED_HEARTBEAT_SECONDS = 15
+# Events a reconnecting client may replay; further behind than this it is told to reload
+CHANGE_FEED_REPLAY_LIMIT = 1000
+# Events buffered per stream before a slow client is disconnected (it resumes with Last-Event-ID)
+CHANGE_FEED_QUEUE_SIZE = 1000
+# Suggested wait before reconnecting when a worker is at CHANGE_FEED_MAX_STREAMS
+CHANGE_FEED_RETRY_AFTER_SECONDS = 30
+# An id missing from the outbox this long is a rolled-back transaction, not a slow commit
+CHANGE_FEED_GAP_SECONDS = 10
+
+def record_change(kind, recipients, **data):
+    """Add a change event for the users selected by recipients (a select of user_id) to the current transaction"""
+    change = ChangeEvent(kind=kind, data=json.dumps(dict(data, type=kind)))
+    db.session.add(change)
+    db.session.flush()
+    recipient_ids = recipients.subquery()
+    db.session.execute(
+        db.insert(ChangeEventRecipient).from_select(
+            ['event_id', 'user_id'],
+            db.select(db.literal(change.id), recipient_ids.c.user_id)
+        )
+    )
+    db.session.info['change_feed_pending'] = True
+
+def record_experiment_change(kind, owner_id, exp_id, **data):
+    """Change event about one experiment, for its owner and everyone sharing a group with them"""
+    recipients = db.union(co_member_ids_select(owner_id), db.select(db.literal(owner_id).label('user_id')))
+    record_change(kind, recipients, expId=exp_id, **data)
+
+def record_membership_change(kind, group_id, user_id):
+    """Change event about user_id joining or leaving group_id, for the user and the group's members"""
+    recipients = db.union(
+        db.select(GroupMember.user_id).where(GroupMember.group_id == group_id),
+        db.select(db.literal(user_id).label('user_id'))
+    )
+    record_change(kind, recipients, groupId=group_id, userId=user_id)
+
+@event.listens_for(db.session, 'after_commit')
+def wake_change_feed(session):
+    if session.info.pop('change_feed_pending', False):
+        change_feed.wake.set()
+        schedule_pruning()
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_change_feed_wakeup(session):
+    session.info.pop('change_feed_pending', None)
+
+def format_sse(event_id, data):
+    """One Server-Sent Events message"""
+    return f'id: {event_id}\ndata: {data}\n\n'
+
+class ChangeFeed:
+    """Delivers outbox events to the change streams open on this worker"""
+
+    def __init__(self):
+        self.subscribers = {}  # user_id -> set of queues
+        self.stream_count = 0
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.watermark = None  # Every event id <= watermark has been delivered (or skipped)
+        self.delivered = set()  # Ids above the watermark already delivered
+        self.gaps = {}  # Missing id -> when it was first noticed
+
+    def subscribe(self, user_id):
+        """Register a stream for user_id (call within the request); returns its message queue,
+        or None when CHANGE_FEED_MAX_STREAMS streams are already open on this worker"""
+        stream_queue = queue.Queue(maxsize=CHANGE_FEED_QUEUE_SIZE)
+        with self.lock:
+            if self.stream_count >= app.config['CHANGE_FEED_MAX_STREAMS']:
+                return None
+            self.stream_count += 1
+            self.subscribers.setdefault(user_id, set()).add(stream_queue)
+            if self.watermark is None:
+                # Deliver everything committed from now on; streams replay anything older themselves
+                self.watermark = db.session.scalar(db.select(db.func.max(ChangeEvent.id))) or 0
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='change-feed', daemon=True)
+                self.thread.start()
+        return stream_queue
+
+    def unsubscribe(self, user_id, stream_queue):
+        with self.lock:
+            queues = self.subscribers.get(user_id, set())
+            if stream_queue in queues:
+                self.stream_count -= 1
+            queues.discard(stream_queue)
+            if not queues:
+                self.subscribers.pop(user_id, None)
+
+    def run(self):
+        while True:
+            self.wake.wait(app.config['CHANGE_FEED_POLL_SECONDS'])
+            self.wake.clear()
+            try:
+                with app.app_context():
+                    self.poll()
+            except Exception as e:
+                print(f"Warning: change feed poll failed: {e}")
+
+    def poll(self):
+        """Deliver outbox events above the watermark to local subscribers"""
+        rows = db.session.execute(
+            db.select(ChangeEvent.id, ChangeEvent.data)
+            .where(ChangeEvent.id > self.watermark)
+            .order_by(ChangeEvent.id)
+            .limit(CHANGE_FEED_REPLAY_LIMIT)
+        ).all()
+        new_rows = [row for row in rows if row.id not in self.delivered]
+        with self.lock:
+            user_ids = list(self.subscribers)
+        if new_rows and user_ids:
+            recipients = db.session.execute(
+                db.select(ChangeEventRecipient.event_id, ChangeEventRecipient.user_id)
+                .where(
+                    ChangeEventRecipient.event_id.in_([row.id for row in new_rows]),
+                    ChangeEventRecipient.user_id.in_(user_ids)
+                )
+            ).all()
+            audience = {}
+            for event_id, user_id in recipients:
+                audience.setdefault(event_id, []).append(user_id)
+            for row in new_rows:
+                for user_id in audience.get(row.id, ()):
+                    self.publish(user_id, (row.id, row.data))
+        self.delivered.update(row.id for row in new_rows)
+        db.session.rollback()
+        self.advance_watermark()
+
+    def publish(self, user_id, message):
+        with self.lock:
+            queues = list(self.subscribers.get(user_id, ()))
+        for stream_queue in queues:
+            try:
+                stream_queue.put_nowait(message)
+            except queue.Full:
+                # Drop the stream; the client reconnects and replays from its last id
+                self.unsubscribe(user_id, stream_queue)
+                with stream_queue.mutex:
+                    stream_queue.queue.clear()
+                stream_queue.put_nowait(None)
+
+    def advance_watermark(self):
+        """Move the watermark over delivered ids and over gaps too old to be uncommitted transactions"""
+        now = time.monotonic()
+        while self.delivered:
+            next_id = self.watermark + 1
+            if next_id in self.delivered:
+                self.delivered.discard(next_id)
+            elif now - self.gaps.setdefault(next_id, now) < CHANGE_FEED_GAP_SECONDS:
+                # A transaction holding this id may still commit; wait for it
+                return
+            self.gaps.pop(next_id, None)
+            self.watermark = next_id
+
+change_feed = ChangeFeed()
+
+def prune_change_events(retention_seconds):
+    """Delete change events older than retention_seconds; returns how many were removed"""
+    cutoff = datetime.now() - timedelta(seconds=retention_seconds)
+    last_old_id = db.session.scalar(db.select(db.func.max(ChangeEvent.id)).where(ChangeEvent.date_created < cutoff))
+    if last_old_id is None:
+        return 0
+    db.session.execute(db.delete(ChangeEventRecipient).where(ChangeEventRecipient.event_id <= last_old_id))
+    removed = db.session.execute(db.delete(ChangeEvent).where(ChangeEvent.id <= last_old_id)).rowcount
+    db.session.commit()
+    return removed
+
+def prune_tombstones(retention_days):
+    """Delete tombstones older than retention_days; returns how many were removed"""
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    removed = db.session.execute(db.delete(Tombstone).where(Tombstone.date_deleted < cutoff)).rowcount
+    db.session.commit()
+    return removed
+
+# Pruning
+# Change events and sync tombstones are recorded whether or not anyone follows /api/events or
+# syncs, so expired rows are pruned by whichever worker commits changes (every transaction writing
+# a tombstone also records a change event), on a background thread at most once per
+# PRUNE_INTERVAL_SECONDS; `flask prune` does the same from a scheduled job.
+PRUNE_INTERVAL_SECONDS = 60
+pruning_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prune')
+pruning_lock = threading.Lock()
+last_pruning = None  # time.monotonic() of this worker's last scheduled run
+
+def prune_expired_records():
+    """Delete change events and tombstones past their retention; returns {table: rows removed}"""
+    return {
+        'change events': prune_change_events(app.config['CHANGE_FEED_RETENTION_SECONDS']),
+        'tombstones': prune_tombstones(app.config['SYNC_TOMBSTONE_RETENTION_DAYS']),
+    }
+
+def schedule_pruning():
+    """Prune expired records on the background thread unless this worker did so recently"""
+    global last_pruning
+    with pruning_lock:
+        now = time.monotonic()
+        if last_pruning is not None and now - last_pruning < PRUNE_INTERVAL_SECONDS:
+            return None
+        last_pruning = now
+    def run():
+        with app.app_context():
+            try:
+                prune_expired_records()
+            except Exception as e:
+                print(f"Warning: pruning failed: {e}")
+    return pruning_executor.submit(run)
+
+# Full-Text Search
+# On SQLite, FTS5 tables (experiment_fts over title/hypothesis/protocol/analysis, experiment_log_fts
+# over log content) index the rows of their source tables and are kept in step by triggers, so the
+# bulk INSERT/UPDATE/DELETE statements used by the routes stay indexed too. On PostgreSQL the same
+# text is indexed through generated tsvector columns with GIN indexes. Both are created by migration 8.
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
+# Words beyond this are ignored so one request cannot build an arbitrarily large query
+MAX_SEARCH_TERMS = 16
+# Deepest result a cursor may point at: ranked results that far down are noise, every page
+# re-ranks everything before its offset, and larger values overflow the OFFSET bind
+MAX_SEARCH_OFFSET = 10000
+# Matches inside snippets are wrapped in this marker (plain text, safe to render without escaping rules)
+SEARCH_HIGHLIGHT = '**'
+
+def search_terms(text):
+    """Lowercased words of a search string, without any query-syntax characters"""
+    return re.findall(r'\w+', text.lower())[:MAX_SEARCH_TERMS]
+
+def encode_search_cursor(offset):
+    """Encode the position of the next page of ranked search results as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps([offset]).encode('utf-8')).decode('ascii')
+
+def decode_search_cursor(cursor):
+    """Decode a cursor from encode_search_cursor(); returns None if it is malformed or too deep"""
+    try:
+        offset, = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        return None
+    if not isinstance(offset, int) or isinstance(offset, bool) or not 0 <= offset <= MAX_SEARCH_OFFSET:
+        return None
+    return offset
+
+def search_tsquery(terms):
+    """PostgreSQL tsquery for terms: every term must match, the last one also as a prefix (search as you type)"""
+    return db.func.to_tsquery('english', ' & '.join(terms[:-1] + [terms[-1] + ':*']))
+
+def search_fts_match(terms):
+    """SQLite FTS5 MATCH string for terms: quoted terms are ANDed, the last one also matches as a prefix"""
+    return ' '.join(f'"{term}"' for term in terms) + '*'
+
+def search_selects(terms, visibility):
+    """(experiment hits, log hits) selects of (kind, pk, score) for terms, scored so that higher ranks first
+
+    Only what ranking needs: snippets and display columns are fetched for the returned page
+    alone by search_hit_details().
+    """
+    experiment_kind = db.literal_column("'experiment'").label('kind')
+    log_kind = db.literal_column("'log'").label('kind')
+    if db.engine.dialect.name == 'postgresql':
+        query = search_tsquery(terms)
+        experiment_vector = db.literal_column('experiment.search_vector')
+        log_vector = db.literal_column('experiment_log.search_vector')
+        experiments = (
+            db.select(experiment_kind, Experiment.id.label('pk'), db.func.ts_rank_cd(experiment_vector, query).label('score'))
+            .where(experiment_vector.op('@@')(query))
+        )
+        logs = (
+            db.select(log_kind, ExperimentLog.id.label('pk'), db.func.ts_rank_cd(log_vector, query).label('score'))
+            .select_from(ExperimentLog)
+            .join(Experiment, Experiment.id == ExperimentLog.experiment_id)
+            .where(log_vector.op('@@')(query))
+        )
+    else:
+        match = search_fts_match(terms)
+        experiment_fts = db.table('experiment_fts', db.column('rowid'))
+        log_fts = db.table('experiment_log_fts', db.column('rowid'))
+        experiments = (
+            db.select(
+                experiment_kind,
+                experiment_fts.c.rowid.label('pk'),
+                # bm25() is lower for better matches; titles weigh four times the other fields
+                (-db.literal_column('bm25(experiment_fts, 4.0, 1.0, 1.0, 1.0)')).label('score'),
+            )
+            .select_from(experiment_fts)
+            .join(Experiment, Experiment.id == experiment_fts.c.rowid)
+            .where(db.literal_column('experiment_fts').op('MATCH')(match))
+        )
+        logs = (
+            db.select(log_kind, log_fts.c.rowid.label('pk'), (-db.literal_column('bm25(experiment_log_fts)')).label('score'))
+            .select_from(log_fts)
+            .join(ExperimentLog, ExperimentLog.id == log_fts.c.rowid)
+            .join(Experiment, Experiment.id == ExperimentLog.experiment_id)
+            .where(db.literal_column('experiment_log_fts').op('MATCH')(match))
+        )
+    return experiments.where(visibility), logs.where(visibility)
+
+def search_hit_columns(kind, pk, snippet, log_id, log_timestamp):
+    """Display columns shared by both search_hit_details() arms, in the order the UNION needs them"""
+    return (
+        db.literal_column(f"'{kind}'").label('kind'),
+        pk.label('pk'),
+        snippet.label('snippet'),
+        Experiment.exp_id,
+        Experiment.title,
+        Experiment.status,
+        Experiment.start_date,
+        Experiment.owner_id,
+        User.name.label('owner_name'),
+        log_id.label('log_id'),
+        log_timestamp.label('log_timestamp'),
+    )
+
+def search_hit_details(terms, hits):
+    """{(kind, pk): row} with the snippet and display columns of ranked hits, in one query
+
+    Snippets (snippet() / ts_headline) are the expensive part of a search, so they are only
+    built for the page being returned, never for every match.
+    """
+    experiment_ids = [hit.pk for hit in hits if hit.kind == 'experiment']
+    log_ids = [hit.pk for hit in hits if hit.kind == 'log']
+    no_log_id = db.cast(db.null(), db.Integer)
+    no_log_timestamp = db.cast(db.null(), db.String)
+    selects = []
+    if db.engine.dialect.name == 'postgresql':
+        query = search_tsquery(terms)
+        headline_options = f'StartSel={SEARCH_HIGHLIGHT}, StopSel={SEARCH_HIGHLIGHT}, MaxWords=24, MinWords=8'
+        experiment_text = db.func.concat_ws(' ', Experiment.title, Experiment.hypothesis, Experiment.protocol, Experiment.analysis)
+        if experiment_ids:
+            selects.append(
+                db.select(*search_hit_columns(
+                    'experiment', Experiment.id,
+                    db.func.ts_headline('english', experiment_text, query, headline_options),
+                    no_log_id, no_log_timestamp,
+                ))
+                .where(Experiment.id.in_(experiment_ids))
+            )
+        if log_ids:
+            selects.append(
+                db.select(*search_hit_columns(
+                    'log', ExperimentLog.id,
+                    db.func.ts_headline('english', ExperimentLog.content, query, headline_options),
+                    ExperimentLog.id, ExperimentLog.timestamp,
+                ))
+                .select_from(ExperimentLog)
+                .join(Experiment, Experiment.id == ExperimentLog.experiment_id)
+                .where(ExperimentLog.id.in_(log_ids))
+            )
+    else:
+        # snippet() only works on rows of a MATCH query, so the match is repeated for the page's rowids
+        match = search_fts_match(terms)
+        experiment_fts = db.table('experiment_fts', db.column('rowid'))
+        log_fts = db.table('experiment_log_fts', db.column('rowid'))
+        if experiment_ids:
+            selects.append(
+                db.select(*search_hit_columns(
+                    'experiment', Experiment.id,
+                    db.func.snippet(db.literal_column('experiment_fts'), -1, SEARCH_HIGHLIGHT, SEARCH_HIGHLIGHT, '…', 16),
+                    no_log_id, no_log_timestamp,
+                ))
+                .select_from(experiment_fts)
+                .join(Experiment, Experiment.id == experiment_fts.c.rowid)
+                .where(db.literal_column('experiment_fts').op('MATCH')(match), experiment_fts.c.rowid.in_(experiment_ids))
+            )
+        if log_ids:
+            selects.append(
+                db.select(*search_hit_columns(
+                    'log', ExperimentLog.id,
+                    db.func.snippet(db.literal_column('experiment_log_fts'), 0, SEARCH_HIGHLIGHT, SEARCH_HIGHLIGHT, '…', 16),
+                    ExperimentLog.id, ExperimentLog.timestamp,
+                ))
+                .select_from(log_fts)
+                .join(ExperimentLog, ExperimentLog.id == log_fts.c.rowid)
+                .join(Experiment, Experiment.id == ExperimentLog.experiment_id)
+                .where(db.literal_column('experiment_log_fts').op('MATCH')(match), log_fts.c.rowid.in_(log_ids))
+            )
+    if not selects:
+        return {}
+    selects = [arm.outerjoin(User, User.id == Experiment.owner_id) for arm in selects]
+    query = selects[0] if len(selects) == 1 else db.union_all(*selects)
+    return {(row.kind, row.pk): row for row in db.session.execute(query)}
+
+def search_hit_dict(hit, details):
+    """Serialize a ranked hit from search_selects() with its row from search_hit_details()"""
+    result = {
+        'type': hit.kind,
+        'score': hit.score,
+        'snippet': details.snippet or '',
+        'experiment': experiment_summary_dict(details),
+    }
+    if hit.kind == 'log':
+        result['log'] = {'id': details.log_id, 'timestamp': details.log_timestamp}
+    return result
+
+def parse_content_range(header):
+    """Parse 'bytes start-end/total' (total may be '*'); returns (start, end, total) or None"""
+    match = re.match(r'^bytes (\d+)-(\d+)/(\d+|\*)$', header or '')
+    if not match:
+        return None
+    start, end = int(match.group(1)), int(match.group(2))
+    total = None if match.group(3) == '*' else int(match.group(3))
+    if end < start or (total is not None and end >= total):
+        return None
+    return start, end, total
+
+# Password Hashing
+# Key derivation is deliberately slow (scrypt also needs 32 MiB per hash), so it runs in a small
+# process pool: a burst of logins queues for PASSWORD_HASH_WORKERS processes instead of taking
+# CPU and memory from every other request thread. The pool starts on first use, keeping it off
+# the cold-start path.
+password_hash_pool = None
+password_hash_pool_lock = threading.Lock()
+password_hash_prefixes = {}  # PASSWORD_HASH_METHOD -> method prefix Werkzeug writes for it
+
+def run_password_hashing(function, *args):
+    """Run a werkzeug.security function in the hashing pool (or inline when it is disabled)"""
+    global password_hash_pool
+    if app.config['PASSWORD_HASH_WORKERS'] <= 0:
+        return function(*args)
+    with password_hash_pool_lock:
+        if password_hash_pool is None:
+            # forkserver children start from a clean single-threaded process instead of forking
+            # this multi-threaded one. They only need werkzeug.security, which the fork server
+            # imports once; when app.py is run directly they also re-import it as '__mp_main__'
+            # (see is_pool_worker_import), as multiprocessing does for any script
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            context = multiprocessing.get_context(method)
+            if method == 'forkserver':
+                context.set_forkserver_preload(['werkzeug.security'])
+            password_hash_pool = ProcessPoolExecutor(
+                max_workers=app.config['PASSWORD_HASH_WORKERS'],
+                mp_context=context
+            )
+        pool = password_hash_pool
+    try:
+        return pool.submit(function, *args).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool next time
+        with password_hash_pool_lock:
+            if password_hash_pool is pool:
+                password_hash_pool = None
+        return function(*args)
+
+def hash_password(password):
+    """Hash a password with PASSWORD_HASH_METHOD"""
+    return run_password_hashing(generate_password_hash, password, app.config['PASSWORD_HASH_METHOD'])
+
+def verify_password(password_hash, password):
+    """Whether password matches a stored hash (made with any method Werkzeug supports)"""
+    return run_password_hashing(check_password_hash, password_hash, password)
+
+def password_needs_rehash(password_hash):
+    """Whether a stored hash was made with parameters other than PASSWORD_HASH_METHOD"""
+    method = app.config['PASSWORD_HASH_METHOD']
+    if method not in password_hash_prefixes:
+        # Werkzeug fills in default parameters ('scrypt' -> 'scrypt:32768:8:1'); ask it once
+        # with the cheapest input rather than duplicating its defaults here
+        password_hash_prefixes[method] = hash_password('').split('$', 1)[0]
+    return password_hash.split('$', 1)[0] != password_hash_prefixes[method]
+
 # API Routes
 
 # Authentication Routes
@@ -323,7 +2268,7 @@ def register():
     
     user = User(
         email=email,
-        password_hash=generate_password_hash(password),
+        password_hash=hash_password(password),
         name=name
     )
     db.session.add(user)
@@ -347,9 +2292,14 @@ def login():
     
     user = User.query.filter_by(email=email).first()
     
-    if not user or not check_password_hash(user.password_hash, password):
+    if not user or not verify_password(user.password_hash, password):
         return jsonify({'error': 'Invalid email or password'}), 401
     
+    # Upgrade hashes made with older parameters while the plaintext is at hand
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = hash_password(password)
+        db.session.commit()
+    
     session['user_id'] = user.id
     return jsonify({'message': 'Login successful', 'user': user.to_dict()}), 200
 
@@ -364,11 +2314,11 @@ def get_current_user():
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    user = User.query.get(user_id)
+    user = get_user_snapshot(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
-    return jsonify({'user': user.to_dict()}), 200
+    return jsonify({'user': user}), 200
 
 @app.route('/api/me', methods=['PUT'])
 def update_current_user():
@@ -376,15 +2326,28 @@ def update_current_user():
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    user = User.query.get(user_id)
+    user = current_user()
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
     data = request.get_json()
     
     # Update name if provided
-    if 'name' in data:
+    renamed_group_ids = None
+    if 'name' in data and data['name'] != user.name:
         user.name = data['name']
+        # The name is part of every experiment, group and member list showing this user
+        db.session.execute(
+            db.update(Experiment)
+            .where(Experiment.owner_id == user_id)
+            .values(version=Experiment.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        shown_in_groups = db.select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+        renamed_group_ids = db.session.scalars(
+            db.select(Group.id).where(or_(Group.id.in_(shown_in_groups), Group.created_by_id == user_id))
+        ).all()
+        bump_group_versions(renamed_group_ids)
     
     # Update email if provided (check for uniqueness)
     if 'email' in data:
@@ -398,9 +2361,13 @@ def update_current_user():
     
     # Update password if provided
     if 'password' in data and data['password']:
-        user.password_hash = generate_password_hash(data['password'])
+        user.password_hash = hash_password(data['password'])
     
     db.session.commit()
+    invalidate_user_cache(user_id)
+    if renamed_group_ids is not None:
+        invalidate_experiment_results(user_id)
+        invalidate_group_results(renamed_group_ids)
     return jsonify({'message': 'Profile updated successfully', 'user': user.to_dict()}), 200
 
 # Group Routes
@@ -410,10 +2377,37 @@ def get_groups():
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    # Get all groups the user is a member of
-    memberships = GroupMember.query.filter_by(user_id=user_id).all()
-    groups = [membership.group for membership in memberships]
-    return jsonify({'groups': [group.to_dict() for group in groups]}), 200
+    cache_key = result_cache_key(f'groups:{user_id}')
+    response = cached_result(cache_key)
+    if response:
+        return response
+    
+    # The listing changes only when the user's memberships or one of those groups' versions do
+    validators = db.session.execute(
+        db.select(GroupMember.id, Group.id, Group.version)
+        .join(Group, Group.id == GroupMember.group_id)
+        .where(GroupMember.user_id == user_id)
+        .order_by(GroupMember.id)
+    ).all()
+    etag = digest_etag('groups', *map(tuple, validators))
+    response = not_modified(etag)
+    if response:
+        return response
+    
+    # Every group the user is a member of, in the order they joined, with creator names
+    # and member counts aggregated by the database (cost independent of group size)
+    own_membership = db.aliased(GroupMember)
+    rows = db.session.execute(
+        group_summary_select()
+        .join(own_membership, and_(own_membership.group_id == Group.id, own_membership.user_id == user_id))
+        .group_by(own_membership.id)
+        .order_by(own_membership.id)
+    )
+    groups = [
+        group.to_dict(creator_name=creator_name, member_count=member_count)
+        for group, creator_name, member_count in rows
+    ]
+    return store_result(cache_key, with_validator(jsonify({'groups': groups}), etag), etag)
 
 @app.route('/api/groups', methods=['POST'])
 def create_group():
@@ -447,11 +2441,14 @@ def create_group():
     db.session.add(member)
     
     # Set as user's current group
-    user = User.query.get(user_id)
+    user = current_user()
     user.current_group_id = group.id
     
+    record_membership_change('membership.joined', group.id, user_id)
     db.session.commit()
-    return jsonify({'group': group.to_dict()}), 201
+    invalidate_user_cache(user_id)
+    invalidate_group_visibility(group.id, user_id)
+    return jsonify({'group': group_summary(group.id)}), 201
 
 @app.route('/api/groups/join', methods=['POST'])
 def join_group():
@@ -479,15 +2476,24 @@ def join_group():
         return jsonify({'error': 'You are already a member of this group'}), 400
     
     # Add user to group
+    affected_ids = set(db.session.scalars(db.select(GroupMember.user_id).where(GroupMember.group_id == group.id)))
+    affected_ids.add(user_id)
+    readable_before = readable_owner_sets(affected_ids)
     member = GroupMember(group_id=group.id, user_id=user_id)
     db.session.add(member)
+    db.session.flush()
+    record_visibility_changes(readable_before, readable_owner_sets(affected_ids))
+    bump_group_versions([group.id])
     
     # Set as user's current group
-    user = User.query.get(user_id)
+    user = current_user()
     user.current_group_id = group.id
     
+    record_membership_change('membership.joined', group.id, user_id)
     db.session.commit()
-    return jsonify({'group': group.to_dict()}), 200
+    invalidate_user_cache(user_id)
+    invalidate_group_visibility(group.id, user_id)
+    return jsonify({'group': group_summary(group.id)}), 200
 
 @app.route('/api/groups/<int:group_id>/leave', methods=['POST'])
 def leave_group(group_id):
@@ -499,15 +2505,23 @@ def leave_group(group_id):
     if not member:
         return jsonify({'error': 'You are not a member of this group'}), 404
     
-    # Remove membership
+    # Remove membership; members who no longer share any group lose each other's experiments
+    affected_ids = set(db.session.scalars(db.select(GroupMember.user_id).where(GroupMember.group_id == group_id)))
+    readable_before = readable_owner_sets(affected_ids)
     db.session.delete(member)
+    db.session.flush()
+    record_visibility_changes(readable_before, readable_owner_sets(affected_ids))
+    bump_group_versions([group_id])
     
     # Clear current group if it was this group
-    user = User.query.get(user_id)
+    user = current_user()
     if user.current_group_id == group_id:
         user.current_group_id = None
     
+    record_membership_change('membership.left', group_id, user_id)
     db.session.commit()
+    invalidate_user_cache(user_id)
+    invalidate_group_visibility(group_id, user_id)
     return jsonify({'message': 'Left group successfully'}), 200
 
 @app.route('/api/groups/<int:group_id>/select', methods=['POST'])
@@ -522,11 +2536,12 @@ def select_group(group_id):
         return jsonify({'error': 'You are not a member of this group'}), 403
     
     # Set as current group
-    user = User.query.get(user_id)
+    user = current_user()
     user.current_group_id = group_id
     db.session.commit()
+    invalidate_user_cache(user_id)
     
-    return jsonify({'message': 'Group selected successfully', 'group': member.group.to_dict()}), 200
+    return jsonify({'message': 'Group selected successfully', 'group': group_summary(group_id)}), 200
 
 @app.route('/api/groups/current', methods=['GET'])
 def get_current_group():
@@ -534,15 +2549,12 @@ def get_current_group():
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    user = User.query.get(user_id)
-    if not user or not user.current_group_id:
+    user = get_user_snapshot(user_id)
+    if not user or not user['currentGroupId']:
         return jsonify({'group': None}), 200
     
-    group = Group.query.get(user.current_group_id)
-    if not group:
-        return jsonify({'group': None}), 200
-    
-    return jsonify({'group': group.to_dict()}), 200
+    # None if the group no longer exists
+    return jsonify({'group': group_summary(user['currentGroupId'])}), 200
 
 @app.route('/api/groups/current/members', methods=['GET'])
 def get_current_group_members():
@@ -550,16 +2562,21 @@ def get_current_group_members():
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    user = User.query.get(user_id)
-    if not user or not user.current_group_id:
+    user = get_user_snapshot(user_id)
+    if not user or not user['currentGroupId']:
         return jsonify({'members': []}), 200
     
-    group = Group.query.get(user.current_group_id)
+    group = db.session.get(Group, user['currentGroupId'])
     if not group:
         return jsonify({'members': []}), 200
     
-    members = GroupMember.query.filter_by(group_id=group.id).all()
-    return jsonify({'members': [member.to_dict() for member in members]}), 200
+    etag = f'group-{group.id}-v{group.version}'
+    response = not_modified(etag)
+    if response:
+        return response
+    
+    members = GroupMember.query.options(joinedload(GroupMember.user)).filter_by(group_id=group.id).all()
+    return with_validator(jsonify({'members': [member.to_dict() for member in members]}), etag)
 
 # Experiment Routes
 @app.route('/api/experiments', methods=['GET'])
@@ -568,41 +2585,423 @@ def get_experiments():
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    user = User.query.get(user_id)
-    if not user:
+    if not get_user_snapshot(user_id):
         return jsonify({'error': 'User not found'}), 404
     
     # Check if scope query parameter is provided
     scope = request.args.get('scope', 'user')  # Default to 'user'
+    # 'summary' returns only the columns the list page renders
+    fields = request.args.get('fields', 'full')
+    if fields not in ('full', 'summary'):
+        return jsonify({'error': 'Invalid fields parameter'}), 400
+    
+    # Server-side filters
+    conditions = [experiment_visibility(user_id, scope)]
+    status = request.args.get('status')
+    if status:
+        conditions.append(Experiment.status == status)
+    owner_id = request.args.get('ownerId')
+    if owner_id:
+        if not owner_id.isdigit():
+            return jsonify({'error': 'Invalid ownerId'}), 400
+        conditions.append(Experiment.owner_id == int(owner_id))
+    start_from = request.args.get('startFrom')
+    if start_from:
+        if not validate_date_string(start_from):
+            return jsonify({'error': 'Invalid startFrom date (expected YYYY-MM-DD)'}), 400
+        conditions.append(Experiment.start_date >= start_from)
+    start_to = request.args.get('startTo')
+    if start_to:
+        if not validate_date_string(start_to):
+            return jsonify({'error': 'Invalid startTo date (expected YYYY-MM-DD)'}), 400
+        conditions.append(Experiment.start_date <= start_to)
+    
+    sort = request.args.get('sort', '-dateCreated')
+    if sort not in EXPERIMENT_SORTS:
+        return jsonify({'error': 'Invalid sort option'}), 400
+    sort_column, descending = EXPERIMENT_SORTS[sort]
+    if descending:
+        order_by = (sort_column.desc(), Experiment.id.desc())
+    else:
+        order_by = (sort_column.asc(), Experiment.id.asc())
+    
+    # Keyset pagination is opt-in (limit or cursor) so existing clients still get a plain list
+    cursor = request.args.get('cursor')
+    paginate = cursor is not None or 'limit' in request.args
+    limit = None
+    if paginate:
+        try:
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return jsonify({'error': 'Invalid limit'}), 400
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if cursor:
+            key = decode_experiment_cursor(cursor, sort_column)
+            if key is None:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            conditions.append(keyset_condition(sort_column, descending, key))
+    
+    # Served without touching the database while the listing's generation is unchanged
+    cache_key = result_cache_key(f"{'visible' if scope == 'group' else 'own'}:{user_id}", request.query_string)
+    response = cached_result(cache_key)
+    if response:
+        return response
+    
+    # The validator comes from a narrow id/version query; any create, delete or version bump
+    # within the page changes its rows, versions or cursor. A match skips loading the page.
+    validator = db.select(Experiment.id, Experiment.version, sort_column).where(*conditions).order_by(*order_by)
+    if limit:
+        # Fetch one extra row to learn whether another page exists
+        validator = validator.limit(limit + 1)
+    rows = db.session.execute(validator).all()
+    page = rows[:limit] if limit else rows
+    next_cursor = None
+    if paginate and len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_experiment_cursor(getattr(last, sort_column.key), last.id)
+    
+    etag = digest_etag('experiments', request.query_string, [(row.id, row.version) for row in page], next_cursor)
+    response = not_modified(etag)
+    if response:
+        return response
+    
+    # Only now load the page itself, by primary key
+    page_ids = [row.id for row in page]
+    if fields == 'summary':
+        # Plain rows straight into dicts: no ORM objects, no logs/files/text columns
+        query = experiment_summary_select().where(Experiment.id.in_(page_ids)).order_by(*order_by)
+        page = db.session.execute(query).all()
+        serialize = experiment_summary_dict
+    else:
+        page = experiment_query().filter(Experiment.id.in_(page_ids)).order_by(*order_by).all()
+        serialize = Experiment.to_dict
     
+    # Return experiments list directly (not wrapped in 'experiments' key)
+    experiments_list = [serialize(row) for row in page]
+    if not paginate:
+        return store_result(cache_key, with_validator(jsonify(experiments_list), etag), etag)
+    return store_result(cache_key, with_validator(jsonify({'experiments': experiments_list, 'nextCursor': next_cursor}), etag), etag)
+
+@app.route('/api/experiments/changes', methods=['GET'])
+def get_experiment_changes():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Sync clients mirror everything visible through the user's groups by default
+    scope = request.args.get('scope', 'group')
+    try:
+        limit = int(request.args.get('limit', DEFAULT_SYNC_BATCH_SIZE))
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    limit = max(1, min(limit, MAX_SYNC_BATCH_SIZE))
+    
+    now = datetime.now()
+    owner_ids = visible_owner_ids(user_id) if scope == 'group' else frozenset([user_id])
+    since = request.args.get('since')
+    positions = {}
+    if since:
+        decoded = decode_sync_cursor(since)
+        if decoded is None:
+            return jsonify({'error': 'Invalid since cursor'}), 400
+        positions, synced_owner_ids = decoded
+        if positions['deleted'][0] < now - timedelta(days=app.config['SYNC_TOMBSTONE_RETENTION_DAYS']):
+            # Deletions this old may have been pruned, so the delta would be incomplete
+            return jsonify({'error': 'Cursor expired; sync again without since'}), 410
+        if synced_owner_ids is None or owner_ids - synced_owner_ids:
+            # A newly readable owner's rows may predate the cursor: send every row again
+            # (deletions still continue from the cursor)
+            for kind in ('experiments', 'logs', 'files'):
+                positions.pop(kind)
+    # A first sync downloads current rows only; there is nothing to delete yet
+    settled = (now - timedelta(seconds=SYNC_CLOCK_MARGIN_SECONDS), 0)
+    if not since:
+        positions['deleted'] = settled
+    
+    visibility = experiment_visibility(user_id, scope)
+    # Deletions by readable owners, plus experiments this user lost access to (group scope only:
+    # a user never loses access to their own experiments)
+    tombstone_visibility = and_(Tombstone.viewer_id.is_(None), Tombstone.owner_id.in_(owner_ids))
     if scope == 'group':
-        # Get user's own experiments
-        experiments = Experiment.query.filter_by(owner_id=user_id).all()
-        all_experiment_ids = {exp.id for exp in experiments}
-        
-        # Get all groups the user is a member of
-        memberships = GroupMember.query.filter_by(user_id=user_id).all()
-        
-        # Get experiments from all group members across all groups
-        for membership in memberships:
-            group = Group.query.get(membership.group_id)
-            if group:
-                # Get all member user IDs in this group
-                member_ids = [member.user_id for member in group.members]
-                # Get experiments from all group members
-                group_experiments = Experiment.query.filter(Experiment.owner_id.in_(member_ids)).all()
-                # Combine and deduplicate
-                for exp in group_experiments:
-                    if exp.id not in all_experiment_ids:
-                        experiments.append(exp)
-                        all_experiment_ids.add(exp.id)
+        tombstone_visibility = or_(tombstone_visibility, Tombstone.viewer_id == user_id)
+    sources = {
+        'experiments': (
+            db.select(
+                Experiment.id.label('pk'), Experiment.date_updated.label('changed_at'),
+                Experiment.exp_id, Experiment.title, Experiment.status, Experiment.start_date,
+                Experiment.owner_id, User.name.label('owner_name'), Experiment.hypothesis,
+                Experiment.protocol, Experiment.analysis, Experiment.version,
+            )
+            .outerjoin(User, User.id == Experiment.owner_id)
+            .where(visibility),
+            Experiment.date_updated, Experiment.id,
+        ),
+        'logs': (
+            db.select(
+                ExperimentLog.id.label('pk'), ExperimentLog.date_updated.label('changed_at'),
+                ExperimentLog.timestamp, ExperimentLog.content, Experiment.exp_id,
+            )
+            .join(Experiment, Experiment.id == ExperimentLog.experiment_id)
+            .where(visibility),
+            ExperimentLog.date_updated, ExperimentLog.id,
+        ),
+        'files': (
+            db.select(
+                ExperimentFile.id.label('pk'), ExperimentFile.date_updated.label('changed_at'),
+                ExperimentFile.original_filename, ExperimentFile.file_size, ExperimentFile.mime_type,
+                ExperimentFile.content_hash, ExperimentFile.date_created, Experiment.exp_id,
+            )
+            .join(Experiment, Experiment.id == ExperimentFile.experiment_id)
+            .where(visibility),
+            ExperimentFile.date_updated, ExperimentFile.id,
+        ),
+        'deleted': (
+            db.select(
+                Tombstone.id.label('pk'), Tombstone.date_deleted.label('changed_at'),
+                Tombstone.kind, Tombstone.record_id, Tombstone.exp_id,
+            )
+            .where(tombstone_visibility),
+            Tombstone.date_deleted, Tombstone.id,
+        ),
+    }
+    
+    # Each kind is read with its own keyset over (modification time, id)
+    results = {}
+    next_positions = {}
+    has_more = False
+    for kind, (query, changed_column, pk_column) in sources.items():
+        if kind in positions:
+            query = query.where(keyset_condition(changed_column, False, positions[kind], pk_column))
+        rows = db.session.execute(query.order_by(changed_column, pk_column).limit(limit + 1)).all()
+        page = rows[:limit]
+        results[kind] = page
+        reached = (page[-1].changed_at, page[-1].pk) if page else positions.get(kind, settled)
+        if len(rows) > limit:
+            # Continue right after this page on the next request
+            has_more = True
+            next_positions[kind] = reached
+        else:
+            # Caught up: hold back to the settled time, but never before where this request started
+            next_positions[kind] = max(min(reached, settled), positions.get(kind, min(reached, settled)))
+    
+    return jsonify({
+        'experiments': [
+            dict(
+                experiment_summary_dict(row),
+                hypothesis=row.hypothesis or '',
+                protocol=row.protocol or '',
+                analysis=row.analysis or '',
+                version=row.version,
+                dateUpdated=row.changed_at.isoformat() if row.changed_at else None,
+            )
+            for row in results['experiments']
+        ],
+        'logs': [
+            {'id': row.pk, 'expId': row.exp_id, 'timestamp': row.timestamp, 'content': row.content}
+            for row in results['logs']
+        ],
+        'files': [
+            {
+                'id': row.pk,
+                'expId': row.exp_id,
+                'filename': row.original_filename,
+                'fileSize': row.file_size,
+                'mimeType': row.mime_type,
+                'sha256': row.content_hash,
+                'dateCreated': row.date_created.isoformat() if row.date_created else None,
+            }
+            for row in results['files']
+        ],
+        'deleted': [
+            {'type': row.kind, 'id': row.exp_id if row.kind == 'experiment' else row.record_id, 'expId': row.exp_id}
+            for row in results['deleted']
+        ],
+        'cursor': encode_sync_cursor(next_positions, owner_ids),
+        'hasMore': has_more,
+    }), 200
+
+@app.route('/api/experiments/export', methods=['GET'])
+def export_experiments():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Exports default to everything visible through the user's groups
+    scope = request.args.get('scope', 'group')
+    fields = request.args.get('fields', 'full')
+    if fields not in ('full', 'summary'):
+        return jsonify({'error': 'Invalid fields parameter'}), 400
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'json'):
+        return jsonify({'error': 'Invalid format (expected ndjson or json)'}), 400
+    
+    visibility = experiment_visibility(user_id, scope)
+    if fields == 'summary':
+        stmt = experiment_summary_select().where(visibility)
+        serialize = experiment_summary_dict
     else:
-        # Get only user's own experiments (default)
-        experiments = Experiment.query.filter_by(owner_id=user_id).all()
+        stmt = db.select(Experiment).options(*experiment_load_options()).where(visibility)
+        serialize = Experiment.to_dict
+    # yield_per streams from a server-side cursor in fixed-size batches
+    stmt = stmt.order_by(Experiment.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    
+    def generate():
+        result = db.session.execute(stmt)
+        if fields == 'full':
+            result = result.scalars()
+        first = True
+        if export_format == 'json':
+            yield '['
+        for batch in result.partitions():
+            items = [json.dumps(serialize(item)) for item in batch]
+            if export_format == 'ndjson':
+                yield '\n'.join(items) + '\n'
+            else:
+                yield ('' if first else ',') + ','.join(items)
+            first = False
+        if export_format == 'json':
+            yield ']'
     
-    # Return experiments list directly (not wrapped in 'experiments' key)
-    experiments_list = [exp.to_dict() for exp in experiments]
-    return jsonify(experiments_list), 200
+    mimetype = 'application/x-ndjson' if export_format == 'ndjson' else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+@app.route('/api/search', methods=['GET'])
+def search():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    terms = search_terms(request.args.get('q', ''))
+    if not terms:
+        return jsonify({'error': 'Search query is required'}), 400
+    # Searches cover everything visible through the user's groups by default
+    scope = request.args.get('scope', 'group')
+    kind = request.args.get('type', 'all')
+    if kind not in ('all', 'experiments', 'logs'):
+        return jsonify({'error': 'Invalid type (expected all, experiments or logs)'}), 400
+    try:
+        limit = int(request.args.get('limit', DEFAULT_SEARCH_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    limit = max(1, min(limit, MAX_SEARCH_PAGE_SIZE))
+    offset = 0
+    cursor = request.args.get('cursor')
+    if cursor:
+        offset = decode_search_cursor(cursor)
+        if offset is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+    
+    # Same visibility rule as GET /api/experiments, applied to the index matches
+    experiments, logs = search_selects(terms, experiment_visibility(user_id, scope))
+    if kind == 'experiments':
+        query = experiments.subquery()
+    elif kind == 'logs':
+        query = logs.subquery()
+    else:
+        query = db.union_all(experiments, logs).subquery()
+    # Ranking needs every match scored anyway, so an offset costs little over a keyset here;
+    # one extra row tells whether another page exists
+    rows = db.session.execute(
+        db.select(query)
+        .order_by(query.c.score.desc(), query.c.kind, query.c.pk)
+        .offset(offset)
+        .limit(limit + 1)
+    ).all()
+    page = rows[:limit]
+    # Results end at MAX_SEARCH_OFFSET; refine the query to see past them
+    next_cursor = encode_search_cursor(offset + limit) if len(rows) > limit and offset + limit <= MAX_SEARCH_OFFSET else None
+    # A hit deleted between the two queries is left out of the page
+    details = search_hit_details(terms, page)
+    results = [search_hit_dict(hit, details[(hit.kind, hit.pk)]) for hit in page if (hit.kind, hit.pk) in details]
+    return jsonify({'results': results, 'nextCursor': next_cursor}), 200
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # The dashboard summarises the user's own experiments by default, like GET /api/experiments
+    scope = request.args.get('scope', 'user')
+    
+    # Listing generations are bumped by every experiment, log and file write, so cached
+    # statistics are served without touching the database until something changes
+    cache_key = result_cache_key(f"{'visible' if scope == 'group' else 'own'}:{user_id}", 'stats', request.query_string)
+    response = cached_result(cache_key)
+    if response:
+        return response
+    
+    # Counts per (owner, status), aggregated from idx_experiment_owner_status alone. The count,
+    # id sum and latest modification time of each group double as the validator: any create,
+    # delete, status change or write to an experiment's logs/files changes one of them.
+    counts = db.session.execute(
+        db.select(
+            Experiment.owner_id,
+            Experiment.status,
+            db.func.count(Experiment.id).label('total'),
+            db.func.sum(Experiment.id).label('id_sum'),
+            db.func.max(Experiment.date_updated).label('last_updated'),
+        )
+        .where(experiment_visibility(user_id, scope))
+        .group_by(Experiment.owner_id, Experiment.status)
+        .order_by(Experiment.owner_id, Experiment.status)
+    ).all()
+    etag = digest_etag('stats', request.query_string, *map(tuple, counts))
+    response = not_modified(etag)
+    if response:
+        return response
+    
+    by_status = {}
+    by_owner = {}
+    for row in counts:
+        by_status[row.status] = by_status.get(row.status, 0) + row.total
+        owner = by_owner.setdefault(row.owner_id, {'ownerId': row.owner_id, 'total': 0, 'byStatus': {}})
+        owner['total'] += row.total
+        owner['byStatus'][row.status] = row.total
+    if by_owner:
+        for owner_id, name in db.session.execute(db.select(User.id, User.name).where(User.id.in_(list(by_owner)))):
+            by_owner[owner_id]['owner'] = name
+    owners = sorted(by_owner.values(), key=lambda owner: (-owner['total'], owner['ownerId']))
+    for owner in owners:
+        owner.setdefault('owner', 'Unknown')
+    
+    # Recent activity: the latest changed experiments with their newest log (one grouped query)
+    recent = db.session.execute(
+        experiment_summary_select()
+        .add_columns(Experiment.date_updated)
+        .where(experiment_visibility(user_id, scope))
+        .order_by(Experiment.date_updated.desc(), Experiment.id.desc())
+        .limit(RECENT_ACTIVITY_LIMIT)
+    ).all()
+    last_logs = {}
+    if recent:
+        newest_log_ids = (
+            db.select(db.func.max(ExperimentLog.id))
+            .where(ExperimentLog.experiment_id.in_([row.id for row in recent]))
+            .group_by(ExperimentLog.experiment_id)
+        )
+        last_logs = {
+            log.experiment_id: {'id': log.id, 'timestamp': log.timestamp, 'content': log.content}
+            for log in db.session.execute(
+                db.select(ExperimentLog.id, ExperimentLog.experiment_id, ExperimentLog.timestamp, ExperimentLog.content)
+                .where(ExperimentLog.id.in_(newest_log_ids))
+            )
+        }
+    
+    payload = {
+        'total': sum(by_status.values()),
+        'byStatus': by_status,
+        'byOwner': owners,
+        'recent': [
+            dict(
+                experiment_summary_dict(row),
+                lastActivity=row.date_updated.isoformat() if row.date_updated else None,
+                lastLog=last_logs.get(row.id),
+            )
+            for row in recent
+        ],
+    }
+    return store_result(cache_key, with_validator(jsonify(payload), etag), etag)
 
 @app.route('/api/experiments', methods=['POST'])
 def create_experiment():
@@ -635,7 +3034,9 @@ def create_experiment():
     )
     
     db.session.add(experiment)
+    record_experiment_change('experiment.created', user_id, exp_id, version=1, experiment=experiment_change_summary(experiment, get_user_snapshot(user_id)['name']))
     db.session.commit()
+    invalidate_experiment_results(user_id)
     
     return jsonify({'experiment': experiment.to_dict()}), 201
 
@@ -649,32 +3050,24 @@ def get_experiment(exp_id):
     if not validate_experiment_id(exp_id):
         return jsonify({'error': 'Invalid experiment ID format'}), 400
     
-    # First check if user owns the experiment
-    experiment = Experiment.query.filter_by(exp_id=exp_id, owner_id=user_id).first()
+    # Revalidation only needs the version column; the full experiment is loaded on a miss
+    if request.if_none_match:
+        version = db.session.scalar(
+            db.select(Experiment.version)
+            .where(Experiment.exp_id == exp_id, experiment_access_condition(user_id))
+        )
+        if version is not None:
+            response = not_modified(experiment_etag(exp_id, version))
+            if response:
+                return response
     
-    # If not found, check if it belongs to a group member
-    if not experiment:
-        # Get all groups the user is a member of
-        memberships = GroupMember.query.filter_by(user_id=user_id).all()
-        member_ids = {user_id}  # Include user's own ID
-        
-        for membership in memberships:
-            group = Group.query.get(membership.group_id)
-            if group:
-                # Get all member user IDs in this group
-                for member in group.members:
-                    member_ids.add(member.user_id)
-        
-        # Try to find experiment owned by any group member
-        experiment = Experiment.query.filter(
-            Experiment.exp_id == exp_id,
-            Experiment.owner_id.in_(member_ids)
-        ).first()
+    # Owned by the user or by anyone sharing a group with them
+    experiment = find_readable_experiment(exp_id, user_id, experiment_query())
     
     if not experiment:
         return jsonify({'error': 'Experiment not found'}), 404
     
-    return jsonify({'experiment': experiment.to_dict()}), 200
+    return with_validator(jsonify({'experiment': experiment.to_dict()}), experiment_etag(exp_id, experiment.version))
 
 @app.route('/api/experiments/<exp_id>', methods=['PUT'])
 def update_experiment(exp_id):
@@ -686,7 +3079,8 @@ def update_experiment(exp_id):
     if not validate_experiment_id(exp_id):
         return jsonify({'error': 'Invalid experiment ID format'}), 400
     
-    experiment = Experiment.query.filter_by(exp_id=exp_id, owner_id=user_id).first()
+    # The owner's name goes into the change event
+    experiment = Experiment.query.options(joinedload(Experiment.owner_user)).filter_by(exp_id=exp_id, owner_id=user_id).first()
     if not experiment:
         return jsonify({'error': 'Experiment not found'}), 404
     
@@ -703,18 +3097,25 @@ def update_experiment(exp_id):
     if 'analysis' in data:
         experiment.analysis = data['analysis']
     if 'logs' in data:
-        # Replace all logs
-        ExperimentLog.query.filter_by(experiment_id=experiment.id).delete()
-        for log_data in data['logs']:
-            log = ExperimentLog(
-                experiment_id=experiment.id,
-                timestamp=log_data['timestamp'],
-                content=log_data['content']
-            )
-            db.session.add(log)
-    
+        logs = data['logs']
+        if not isinstance(logs, list) or not all(
+            isinstance(log_data, dict)
+            and isinstance(log_data.get('timestamp'), str)
+            and isinstance(log_data.get('content'), str)
+            # Ids are matched against stored integer ids (bools are ints in Python, but not ids)
+            and (log_data.get('id') is None or (isinstance(log_data['id'], int) and not isinstance(log_data['id'], bool)))
+            for log_data in logs
+        ):
+            return jsonify({'error': 'Each log requires a string timestamp and content, and an integer id if it has one'}), 400
+        # Diff against stored logs; only new, changed and removed rows are written
+        sync_experiment_logs(experiment.id, logs)
+    
+    version = bump_experiment_version(experiment.id)
+    record_experiment_change('experiment.updated', user_id, exp_id, version=version, experiment=experiment_change_summary(experiment, experiment.owner_user.name))
     db.session.commit()
-    return jsonify({'experiment': experiment.to_dict()}), 200
+    invalidate_experiment_results(user_id)
+    experiment = reload_experiment(experiment)
+    return versioned_response({'experiment': experiment.to_dict()}, exp_id, version, 200)
 
 @app.route('/api/experiments/<exp_id>', methods=['DELETE'])
 def delete_experiment(exp_id):
@@ -726,12 +3127,26 @@ def delete_experiment(exp_id):
     if not validate_experiment_id(exp_id):
         return jsonify({'error': 'Invalid experiment ID format'}), 400
     
-    experiment = Experiment.query.filter_by(exp_id=exp_id, owner_id=user_id).first()
-    if not experiment:
+    experiment_pk = db.session.scalar(
+        db.select(Experiment.id).where(Experiment.exp_id == exp_id, Experiment.owner_id == user_id)
+    )
+    if not experiment_pk:
         return jsonify({'error': 'Experiment not found'}), 404
     
-    db.session.delete(experiment)
+    # Queue storage cleanup, then delete children with bulk statements instead of loading
+    # every log and file through the ORM cascade
+    release_experiment_files(experiment_pk)
+    for child in (ExperimentLog, ExperimentFile, UploadSession):
+        db.session.execute(
+            db.delete(child).where(child.experiment_id == experiment_pk).execution_options(synchronize_session=False)
+        )
+    db.session.execute(db.delete(Experiment).where(Experiment.id == experiment_pk).execution_options(synchronize_session=False))
+    # One tombstone covers the experiment's logs and files as well
+    db.session.add(Tombstone(kind='experiment', record_id=experiment_pk, exp_id=exp_id, owner_id=user_id))
+    record_experiment_change('experiment.deleted', user_id, exp_id)
     db.session.commit()
+    invalidate_experiment_results(user_id)
+    schedule_storage_cleanup()
     
     return jsonify({'message': 'Experiment deleted successfully'}), 200
 
@@ -757,9 +3172,70 @@ def add_log(exp_id):
     )
     
     db.session.add(log)
+    version = bump_experiment_version(experiment.id)
+    record_experiment_change('log.created', user_id, exp_id, logId=log.id, version=version)
+    db.session.commit()
+    invalidate_experiment_results(user_id)
+    
+    if wants_slim_response():
+        return versioned_response({'log': log.to_dict(), 'version': version}, exp_id, version, 201)
+    experiment = reload_experiment(experiment)
+    return versioned_response({'log': log.to_dict(), 'experiment': experiment.to_dict()}, exp_id, version, 201)
+
+@app.route('/api/experiments/<exp_id>/logs/batch', methods=['POST'])
+def add_logs_batch(exp_id):
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Validate experiment ID format to prevent injection
+    if not validate_experiment_id(exp_id):
+        return jsonify({'error': 'Invalid experiment ID format'}), 400
+    
+    # Ownership check only needs the primary key, not the experiment row
+    experiment_pk = db.session.scalar(
+        db.select(Experiment.id).where(Experiment.exp_id == exp_id, Experiment.owner_id == user_id)
+    )
+    if not experiment_pk:
+        return jsonify({'error': 'Experiment not found'}), 404
+    
+    data = request.get_json()
+    logs = data.get('logs') if isinstance(data, dict) else None
+    if not isinstance(logs, list) or not logs:
+        return jsonify({'error': 'A non-empty logs list is required'}), 400
+    if len(logs) > MAX_LOG_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_LOG_BATCH_SIZE} logs per batch'}), 400
+    
+    default_timestamp = datetime.now().strftime('%Y-%m-%d %I:%M %p')
+    rows = []
+    for log_data in logs:
+        if (
+            not isinstance(log_data, dict)
+            or not isinstance(log_data.get('timestamp', default_timestamp), str)
+            or not isinstance(log_data.get('content', ''), str)
+        ):
+            return jsonify({'error': 'Each log must be an object with string timestamp and content'}), 400
+        rows.append({
+            'experiment_id': experiment_pk,
+            'timestamp': log_data.get('timestamp', default_timestamp),
+            'content': log_data.get('content', '')
+        })
+    
+    # One executemany INSERT and one commit for the whole batch
+    log_ids = db.session.scalars(
+        db.insert(ExperimentLog).returning(ExperimentLog.id, sort_by_parameter_order=True),
+        rows
+    ).all()
+    version = bump_experiment_version(experiment_pk)
+    record_experiment_change('log.created', user_id, exp_id, logIds=log_ids, version=version)
     db.session.commit()
+    invalidate_experiment_results(user_id)
     
-    return jsonify({'log': log.to_dict(), 'experiment': experiment.to_dict()}), 201
+    payload = {'inserted': len(log_ids), 'ids': log_ids, 'version': version}
+    # Instrument clients get counts only unless they explicitly ask for the experiment
+    if not wants_slim_response(default=True):
+        payload['experiment'] = experiment_query().filter(Experiment.id == experiment_pk).first().to_dict()
+    return versioned_response(payload, exp_id, version, 201)
 
 # File Upload Routes
 @app.route('/api/experiments/<exp_id>/files', methods=['POST'])
@@ -783,15 +3259,20 @@ def upload_file(exp_id):
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    # Generate unique filename
     original_filename = secure_filename(file.filename)
-    file_ext = os.path.splitext(original_filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
     
-    # Save file
-    file.save(file_path)
-    file_size = os.path.getsize(file_path)
+    # Save to a temporary file, measuring size and hash in the same pass
+    temp_path = new_temp_path()
+    hasher = hashlib.sha256()
+    file_size = write_stream(file.stream, temp_path, hasher)
+    content_hash = hasher.hexdigest()
+    
+    # Link to identical stored content, or move the upload into the blob store
+    deduplicated = not claim_blob(content_hash, file_size)
+    if deduplicated:
+        os.remove(temp_path)
+    else:
+        storage.put_file(blob_key(content_hash), temp_path)
     
     # Get MIME type
     mime_type = file.content_type or 'application/octet-stream'
@@ -799,17 +3280,243 @@ def upload_file(exp_id):
     # Create database record
     experiment_file = ExperimentFile(
         experiment_id=experiment.id,
-        filename=unique_filename,
+        filename=blob_key(content_hash),
         original_filename=original_filename,
-        file_path=file_path,
+        file_path=storage.locate(blob_key(content_hash)),
         file_size=file_size,
-        mime_type=mime_type
+        mime_type=mime_type,
+        content_hash=content_hash
     )
     
     db.session.add(experiment_file)
+    version = bump_experiment_version(experiment.id)
+    record_experiment_change('file.created', user_id, exp_id, fileId=experiment_file.id, version=version)
     db.session.commit()
+    invalidate_experiment_results(user_id)
+    
+    payload = {'file': experiment_file.to_dict(), 'deduplicated': deduplicated}
+    if wants_slim_response():
+        payload['version'] = version
+    else:
+        payload['experiment'] = reload_experiment(experiment).to_dict()
+    return versioned_response(payload, exp_id, version, 201)
+
+# Resumable Upload Routes
+# Create a session, PUT raw chunks in order (Content-Range: bytes start-end/total),
+# GET the session to learn the offset to resume from, then complete it into an ExperimentFile.
+@app.route('/api/experiments/<exp_id>/uploads', methods=['POST'])
+def create_upload_session(exp_id):
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Validate experiment ID format to prevent injection
+    if not validate_experiment_id(exp_id):
+        return jsonify({'error': 'Invalid experiment ID format'}), 400
+    
+    experiment_pk = db.session.scalar(
+        db.select(Experiment.id).where(Experiment.exp_id == exp_id, Experiment.owner_id == user_id)
+    )
+    if not experiment_pk:
+        return jsonify({'error': 'Experiment not found'}), 404
+    
+    data = request.get_json() or {}
+    original_filename = secure_filename(data.get('filename') or '')
+    if not original_filename:
+        return jsonify({'error': 'A filename is required'}), 400
+    total_size = data.get('size')
+    if total_size is not None and (not isinstance(total_size, int) or total_size < 0):
+        return jsonify({'error': 'Invalid size'}), 400
+    mime_type = sanitize_string_input(data.get('mimeType'), max_length=100) or 'application/octet-stream'
+    
+    # Content already stored for an experiment the user can see is linked without re-uploading.
+    # Restricting to visible experiments keeps a bare hash from granting access to other labs' data.
+    content_hash = (data.get('sha256') or '').lower()
+    if re.match(r'^[0-9a-f]{64}$', content_hash):
+        blob = db.session.get(FileBlob, content_hash)
+        visible = db.session.scalar(
+            db.select(ExperimentFile.id)
+            .join(Experiment, Experiment.id == ExperimentFile.experiment_id)
+            .where(ExperimentFile.content_hash == content_hash, experiment_access_condition(user_id))
+            .limit(1)
+        )
+        if blob and visible and (total_size is None or total_size == blob.file_size) and acquire_blob_reference(content_hash):
+            experiment_file = ExperimentFile(
+                experiment_id=experiment_pk,
+                filename=blob_key(content_hash),
+                original_filename=original_filename,
+                file_path=storage.locate(blob_key(content_hash)),
+                file_size=blob.file_size,
+                mime_type=mime_type,
+                content_hash=content_hash
+            )
+            db.session.add(experiment_file)
+            version = bump_experiment_version(experiment_pk)
+            record_experiment_change('file.created', user_id, exp_id, fileId=experiment_file.id, version=version)
+            db.session.commit()
+            invalidate_experiment_results(user_id)
+            return versioned_response({'file': experiment_file.to_dict(), 'deduplicated': True, 'version': version}, exp_id, version, 201)
+    
+    upload = UploadSession(
+        id=str(uuid.uuid4()),
+        experiment_id=experiment_pk,
+        user_id=user_id,
+        original_filename=original_filename,
+        mime_type=mime_type,
+        total_size=total_size,
+        bytes_received=0
+    )
+    storage.create_partial(upload.id)
+    db.session.add(upload)
+    db.session.commit()
+    
+    return jsonify({'upload': upload.to_dict()}), 201
+
+@app.route('/api/experiments/<exp_id>/uploads/<upload_id>', methods=['GET'])
+def get_upload_session(exp_id, upload_id):
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Validate experiment ID format to prevent injection
+    if not validate_experiment_id(exp_id):
+        return jsonify({'error': 'Invalid experiment ID format'}), 400
     
-    return jsonify({'file': experiment_file.to_dict(), 'experiment': experiment.to_dict()}), 201
+    upload = get_owned_upload_session(exp_id, upload_id, user_id)
+    if not upload:
+        return jsonify({'error': 'Upload session not found'}), 404
+    
+    return jsonify({'upload': upload.to_dict()}), 200
+
+@app.route('/api/experiments/<exp_id>/uploads/<upload_id>', methods=['PUT'])
+def upload_chunk(exp_id, upload_id):
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Validate experiment ID format to prevent injection
+    if not validate_experiment_id(exp_id):
+        return jsonify({'error': 'Invalid experiment ID format'}), 400
+    
+    upload = get_owned_upload_session(exp_id, upload_id, user_id)
+    if not upload:
+        return jsonify({'error': 'Upload session not found'}), 404
+    
+    content_range = request.headers.get('Content-Range')
+    if content_range:
+        parsed = parse_content_range(content_range)
+        if not parsed:
+            return jsonify({'error': 'Invalid Content-Range header'}), 400
+        start, end, total = parsed
+        if total is not None and upload.total_size is not None and total != upload.total_size:
+            return jsonify({'error': 'Content-Range total does not match the declared size'}), 400
+        length = end - start + 1
+    else:
+        start = upload.bytes_received
+        length = request.content_length
+        if length is None:
+            return jsonify({'error': 'Content-Range or Content-Length is required'}), 411
+    if upload.status != 'open':
+        return jsonify({'error': 'Upload is being completed'}), 409
+    # Chunks must arrive in order; tell the client where to resume otherwise
+    if start != upload.bytes_received:
+        return jsonify({'error': 'Chunk does not start at the current offset', 'offset': upload.bytes_received}), 409
+    # Reserve the byte range before touching the partial data, so a concurrent request for the
+    # same offset cannot interleave its bytes with this one (the loser sees the new offset)
+    if not claim_upload_range(upload.id, start, length):
+        return jsonify({'error': 'Chunk does not start at the current offset', 'offset': upload.bytes_received}), 409
+    
+    stored_size = storage.partial_size(upload.id)
+    if stored_size is None:
+        release_upload_range(upload.id, start, length)
+        return jsonify({'error': 'Partial upload data is missing; start a new upload session'}), 410
+    if stored_size < start:
+        # The request that claimed the previous chunk is still appending it
+        release_upload_range(upload.id, start, length)
+        return jsonify({'error': 'The previous chunk is still being written; retry later', 'offset': start}), 409
+    if stored_size > start:
+        # Leftover bytes from an interrupted chunk that was never recorded
+        discard_partial_tail(upload.id, start)
+    
+    hasher = upload_session_hasher(upload.id)
+    try:
+        written = storage.append_partial(upload.id, start, request.stream, hasher)
+    except ClientDisconnected:
+        discard_partial_tail(upload.id, start)
+        release_upload_range(upload.id, start, length)
+        return jsonify({'error': 'Client disconnected mid-chunk', 'offset': start}), 400
+    except Exception:
+        discard_partial_tail(upload.id, start)
+        release_upload_range(upload.id, start, length)
+        raise
+    if written != length:
+        discard_partial_tail(upload.id, start)
+        release_upload_range(upload.id, start, length)
+        return jsonify({'error': 'Chunk length does not match Content-Range', 'offset': start}), 400
+    
+    return jsonify({'upload': upload.to_dict()}), 200
+
+@app.route('/api/experiments/<exp_id>/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload_session(exp_id, upload_id):
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Validate experiment ID format to prevent injection
+    if not validate_experiment_id(exp_id):
+        return jsonify({'error': 'Invalid experiment ID format'}), 400
+    
+    upload = get_owned_upload_session(exp_id, upload_id, user_id)
+    if not upload:
+        return jsonify({'error': 'Upload session not found'}), 404
+    if upload.total_size is not None and upload.bytes_received != upload.total_size:
+        return jsonify({'error': 'Upload is incomplete', 'offset': upload.bytes_received}), 409
+    # The offset covers claimed chunks; the last one may still be being written
+    if storage.partial_size(upload.id) != upload.bytes_received:
+        return jsonify({'error': 'A chunk is still being written', 'offset': upload.bytes_received}), 409
+    
+    # Only one complete request may proceed; chunks are refused from here on
+    size = upload.bytes_received
+    if not claim_upload_completion(upload.id, size):
+        return jsonify({'error': 'Upload is already being completed or has changed'}), 409
+    
+    content_hash = upload_session_hasher(upload_id).hexdigest()
+    data = request.get_json(silent=True) or {}
+    expected_hash = data.get('sha256')
+    if expected_hash and expected_hash.lower() != content_hash:
+        release_upload_completion(upload_id)
+        return jsonify({'error': 'SHA-256 mismatch', 'sha256': content_hash}), 400
+    
+    try:
+        deduplicated = not claim_blob(content_hash, size)
+        if deduplicated:
+            storage.delete_partial(upload_id)
+        else:
+            storage.promote_partial(upload_id, blob_key(content_hash))
+        
+        experiment_file = ExperimentFile(
+            experiment_id=upload.experiment_id,
+            filename=blob_key(content_hash),
+            original_filename=upload.original_filename,
+            file_path=storage.locate(blob_key(content_hash)),
+            file_size=size,
+            mime_type=upload.mime_type,
+            content_hash=content_hash
+        )
+        db.session.add(experiment_file)
+        db.session.delete(upload)
+        version = bump_experiment_version(upload.experiment_id)
+        record_experiment_change('file.created', user_id, exp_id, fileId=experiment_file.id, version=version)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        release_upload_completion(upload_id)
+        raise
+    with upload_hashers_lock:
+        upload_hashers.pop(upload_id, None)
+    invalidate_experiment_results(user_id)
+    
+    return versioned_response({'file': experiment_file.to_dict(), 'deduplicated': deduplicated, 'version': version}, exp_id, version, 201)
 
 @app.route('/api/experiments/<exp_id>/files/<int:file_id>', methods=['DELETE'])
 def delete_file(exp_id, file_id):
@@ -829,14 +3536,25 @@ def delete_file(exp_id, file_id):
     if not experiment_file:
         return jsonify({'error': 'File not found'}), 404
     
-    # Delete physical file
-    if os.path.exists(experiment_file.file_path):
-        os.remove(experiment_file.file_path)
+    if is_blob_backed(experiment_file):
+        # Shared content is only removed with its last reference
+        release_blob_reference(experiment_file.content_hash)
+    else:
+        # Physical file is removed by the background cleanup worker after commit
+        enqueue_storage_cleanup('key', [experiment_file.filename])
     
+    record_tombstones('file', ExperimentFile, [experiment_file.id])
     db.session.delete(experiment_file)
+    version = bump_experiment_version(experiment.id)
+    record_experiment_change('file.deleted', user_id, exp_id, fileId=file_id, version=version)
     db.session.commit()
+    invalidate_experiment_results(user_id)
+    schedule_storage_cleanup()
     
-    return jsonify({'message': 'File deleted successfully', 'experiment': experiment.to_dict()}), 200
+    if wants_slim_response():
+        return versioned_response({'message': 'File deleted successfully', 'fileId': file_id, 'version': version}, exp_id, version, 200)
+    experiment = reload_experiment(experiment)
+    return versioned_response({'message': 'File deleted successfully', 'experiment': experiment.to_dict()}, exp_id, version, 200)
 
 @app.route('/api/experiments/<exp_id>/files/<int:file_id>/download', methods=['GET'])
 def download_file(exp_id, file_id):
@@ -848,20 +3566,108 @@ def download_file(exp_id, file_id):
     if not validate_experiment_id(exp_id):
         return jsonify({'error': 'Invalid experiment ID format'}), 400
     
-    experiment = Experiment.query.filter_by(exp_id=exp_id, owner_id=user_id).first()
-    if not experiment:
-        return jsonify({'error': 'Experiment not found'}), 404
-    
-    experiment_file = ExperimentFile.query.filter_by(id=file_id, experiment_id=experiment.id).first()
+    # Files of experiments the user can read (own or a co-member's), checked in the same query
+    experiment_file = (
+        ExperimentFile.query
+        .join(Experiment, Experiment.id == ExperimentFile.experiment_id)
+        .filter(ExperimentFile.id == file_id, Experiment.exp_id == exp_id, experiment_access_condition(user_id))
+        .first()
+    )
     if not experiment_file:
         return jsonify({'error': 'File not found'}), 404
     
-    return send_from_directory(
-        app.config['UPLOAD_FOLDER'],
-        experiment_file.filename,
-        as_attachment=True,
-        download_name=experiment_file.original_filename
-    )
+    # Answer revalidation from the stored hash before touching storage
+    if experiment_file.content_hash and experiment_file.content_hash in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(experiment_file.content_hash)
+    else:
+        response = storage.download_response(experiment_file.filename, experiment_file)
+    # Downloads require a session, so shared caches must not keep them
+    response.cache_control.private = True
+    return response
+
+@app.route('/api/events', methods=['GET'])
+def stream_changes():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # EventSource sends Last-Event-ID when reconnecting; lastEventId lets clients resume explicitly
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    if last_event_id is not None and not last_event_id.isdigit():
+        return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+    
+    # Subscribe before reading the outbox so nothing committed in between is missed
+    stream_queue = change_feed.subscribe(user_id)
+    if stream_queue is None:
+        response = jsonify({'error': 'Too many open event streams; try again later'})
+        response.headers['Retry-After'] = str(CHANGE_FEED_RETRY_AFTER_SECONDS)
+        return response, 503
+    preamble = ['retry: 3000\n\n']
+    replayed = set()
+    if last_event_id is None:
+        # Start from the newest event so a later reconnect resumes from here
+        latest = db.session.scalar(db.select(db.func.max(ChangeEvent.id)))
+        if latest:
+            preamble.append(f'id: {latest}\n\n')
+    else:
+        last_event_id = int(last_event_id)
+        oldest = db.session.scalar(db.select(db.func.min(ChangeEvent.id)))
+        missed = db.session.execute(
+            db.select(ChangeEvent.id, ChangeEvent.data)
+            .join(ChangeEventRecipient, ChangeEventRecipient.event_id == ChangeEvent.id)
+            .where(ChangeEventRecipient.user_id == user_id, ChangeEvent.id > last_event_id)
+            .order_by(ChangeEvent.id)
+            .limit(CHANGE_FEED_REPLAY_LIMIT + 1)
+        ).all()
+        if len(missed) > CHANGE_FEED_REPLAY_LIMIT or (oldest is not None and oldest > last_event_id + 1):
+            # Too far behind (or events were pruned): the client reloads its lists instead
+            resume_id = db.session.scalar(db.select(db.func.max(ChangeEvent.id)))
+            preamble.append(format_sse(resume_id, json.dumps({'type': 'resync'})))
+        else:
+            for event_id, data in missed:
+                preamble.append(format_sse(event_id, data))
+                replayed.add(event_id)
+    db.session.close()  # The stream itself never touches the database
+    
+    stream_seconds = app.config['CHANGE_FEED_STREAM_SECONDS']
+    
+    def generate():
+        try:
+            yield from preamble
+            # Streams are recycled so long-lived connections don't pin worker threads forever;
+            # EventSource reconnects on its own and resumes from the last id it received
+            deadline = time.monotonic() + stream_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    message = stream_queue.get(timeout=min(CHANGE_FEED_HEARTBEAT_SECONDS, remaining))
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if message is None:
+                    return  # Fell too far behind; the client reconnects and replays
+                event_id, data = message
+                if event_id not in replayed:
+                    yield format_sse(event_id, data)
+        finally:
+            change_feed.unsubscribe(user_id, stream_queue)
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Counters are per worker process; the 'redis' backend's entries are shared
+    return jsonify({'resultCache': result_cache.stats()}), 200
 
 # ========== Legacy Routes (for existing templates) ==========
 
@@ -899,39 +3705,70 @@ def delete(id):
     db.session.commit()
     return redirect(url_for('index'))
 
-def migrate_database():
-    """Add missing columns and indexes to existing database tables"""
-    from sqlalchemy import inspect, text
-    
-    inspector = inspect(db.engine)
-    db_dialect = db.engine.dialect.name
-    
-    # Check if user table exists and if current_group_id column is missing
-    if 'user' in inspector.get_table_names():
-        columns = [col['name'] for col in inspector.get_columns('user')]
-        if 'current_group_id' not in columns:
-            print("Adding current_group_id column to user table...")
-            with db.engine.connect() as conn:
-                # PostgreSQL uses different syntax for ALTER TABLE
-                if db_dialect == 'postgresql':
-                    conn.execute(text("ALTER TABLE \"user\" ADD COLUMN current_group_id INTEGER"))
-                else:
-                    conn.execute(text("ALTER TABLE user ADD COLUMN current_group_id INTEGER"))
-                conn.commit()
-            print("Migration completed: Added current_group_id column")
-    
-    # Create indexes if they don't exist
-    print("Creating database indexes...")
+# Schema Migrations
+# Versioned, idempotent steps applied in order by `flask db-upgrade` and recorded in the
+# schema_migration table. Workers never inspect the schema: with AUTO_MIGRATE on they only read
+# the recorded version (one query) and apply the steps still pending. Each step runs in its own
+# transaction together with its schema_migration row, and tolerates databases that already
+# received its change from the ad-hoc migrations this runner replaced.
+def create_missing_tables(conn):
+    """Create every table (with its indexes) that does not exist yet"""
+    db.metadata.create_all(bind=conn)
+
+def add_user_current_group(conn):
+    columns = [col['name'] for col in inspect(conn).get_columns('user')]
+    if 'current_group_id' not in columns:
+        # "user" is a reserved word on PostgreSQL
+        conn.execute(text('ALTER TABLE "user" ADD COLUMN current_group_id INTEGER'))
+
+def add_experiment_version(conn):
+    columns = [col['name'] for col in inspect(conn).get_columns('experiment')]
+    if 'version' not in columns:
+        conn.execute(text("ALTER TABLE experiment ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+def add_group_version(conn):
+    columns = [col['name'] for col in inspect(conn).get_columns('group')]
+    if 'version' not in columns:
+        # "group" is a reserved word on both SQLite and PostgreSQL
+        conn.execute(text('ALTER TABLE "group" ADD COLUMN version INTEGER NOT NULL DEFAULT 1'))
+
+def add_file_content_hash(conn):
+    columns = {col['name']: col for col in inspect(conn).get_columns('experiment_file')}
+    if 'content_hash' not in columns:
+        conn.execute(text("ALTER TABLE experiment_file ADD COLUMN content_hash VARCHAR(64)"))
+    # Multi-GB files overflow a 32-bit INTEGER on PostgreSQL (SQLite integers are already 64-bit)
+    if conn.dialect.name == 'postgresql' and columns['file_size']['type'].__class__.__name__ == 'INTEGER':
+        conn.execute(text("ALTER TABLE experiment_file ALTER COLUMN file_size TYPE BIGINT"))
+
+def add_sync_date_updated(conn):
+    # Incremental sync needs a modification time on every synced table; existing rows start
+    # from their creation time (SQLite cannot add a column defaulting to the current time)
+    column_type = 'TIMESTAMP' if conn.dialect.name == 'postgresql' else 'DATETIME'
+    for table in ('experiment', 'experiment_log', 'experiment_file'):
+        columns = [col['name'] for col in inspect(conn).get_columns(table)]
+        if 'date_updated' not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN date_updated {column_type}"))
+            conn.execute(text(f"UPDATE {table} SET date_updated = COALESCE(date_created, CURRENT_TIMESTAMP)"))
+
+def create_query_indexes(conn):
+    """Indexes declared on the models, for tables created before they were added"""
     indexes_to_create = [
         # Experiment indexes
         ("idx_experiment_owner", "experiment", "owner_id"),
         ("idx_experiment_owner_exp", "experiment", "owner_id, exp_id"),
         ("idx_experiment_status", "experiment", "status"),
+        ("idx_experiment_owner_created", "experiment", "owner_id, date_created, id"),
+        ("idx_experiment_owner_start", "experiment", "owner_id, start_date, id"),
+        ("idx_experiment_status_created", "experiment", "status, date_created, id"),
+        ("idx_experiment_owner_updated", "experiment", "owner_id, date_updated, id"),
+        ("idx_experiment_owner_status", "experiment", "owner_id, status, date_updated, id"),
         # ExperimentLog indexes
         ("idx_experiment_log_experiment", "experiment_log", "experiment_id"),
+        ("idx_experiment_log_updated", "experiment_log", "date_updated, id"),
         # ExperimentFile indexes
         ("idx_experiment_file_experiment", "experiment_file", "experiment_id"),
         ("idx_experiment_file_composite", "experiment_file", "experiment_id, id"),
+        ("idx_experiment_file_updated", "experiment_file", "date_updated, id"),
         # GroupMember indexes
         ("idx_group_member_user", "group_member", "user_id"),
         ("idx_group_member_group", "group_member", "group_id"),
@@ -940,57 +3777,227 @@ def migrate_database():
         # Group indexes
         ("idx_group_created_by", "group", "created_by_id"),
     ]
-    
-    existing_indexes = []
-    try:
-        with db.engine.connect() as conn:
-            if db_dialect == 'postgresql':
-                # PostgreSQL: query pg_indexes system catalog
-                result = conn.execute(text("""
-                    SELECT indexname FROM pg_indexes 
-                    WHERE schemaname = 'public' 
-                    AND indexname NOT LIKE 'pg_%'
-                """))
-            else:
-                # SQLite: query sqlite_master
-                result = conn.execute(text("SELECT name FROM sqlite_master WHERE type='index' AND name NOT LIKE 'sqlite_%'"))
-            existing_indexes = [row[0] for row in result]
-    except Exception as e:
-        print(f"Warning: Could not check existing indexes: {e}")
-    
-    created_count = 0
     for index_name, table_name, columns in indexes_to_create:
-        if index_name not in existing_indexes:
-            try:
-                with db.engine.connect() as conn:
-                    # PostgreSQL requires quotes around table names that are reserved words
-                    if db_dialect == 'postgresql':
-                        # Quote table names for PostgreSQL
-                        quoted_table = f'"{table_name}"' if table_name in ['user', 'group'] else table_name
-                        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {quoted_table} ({columns})"))
-                    else:
-                        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"))
-                    conn.commit()
-                created_count += 1
-                print(f"  Created index: {index_name}")
-            except Exception as e:
-                print(f"  Warning: Could not create index {index_name}: {e}")
-    
-    if created_count > 0:
-        print(f"Index migration completed: Created {created_count} indexes")
+        # Quote table names that are reserved words
+        quoted_table = f'"{table_name}"' if table_name in ('user', 'group') else table_name
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {quoted_table} ({columns})"))
+
+def create_search_index(conn):
+    """Full-text search index read by search_selects(); existing rows are indexed as it is created"""
+    if conn.dialect.name == 'postgresql':
+        columns = [col['name'] for col in inspect(conn).get_columns('experiment')]
+        if 'search_vector' in columns:
+            return
+        # Adding a generated column computes it for every existing row
+        conn.execute(text("""
+            ALTER TABLE experiment ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(hypothesis, '') || ' ' || coalesce(protocol, '') || ' ' || coalesce(analysis, '')), 'B')
+            ) STORED
+        """))
+        conn.execute(text("""
+            ALTER TABLE experiment_log ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_experiment_search ON experiment USING GIN (search_vector)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_experiment_log_search ON experiment_log USING GIN (search_vector)"))
+        return
+
+    if 'experiment_fts' in inspect(conn).get_table_names():
+        return
+    # External-content tables store only the index; text is read back from the source rows
+    conn.execute(text("""
+        CREATE VIRTUAL TABLE experiment_fts USING fts5(
+            title, hypothesis, protocol, analysis,
+            content='experiment', content_rowid='id', tokenize='porter unicode61'
+        )
+    """))
+    conn.execute(text("""
+        CREATE VIRTUAL TABLE experiment_log_fts USING fts5(
+            content, content='experiment_log', content_rowid='id', tokenize='porter unicode61'
+        )
+    """))
+    # An external-content row is removed by inserting a 'delete' command with its old values
+    conn.execute(text("""
+        CREATE TRIGGER experiment_fts_insert AFTER INSERT ON experiment BEGIN
+            INSERT INTO experiment_fts(rowid, title, hypothesis, protocol, analysis)
+            VALUES (new.id, new.title, new.hypothesis, new.protocol, new.analysis);
+        END
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER experiment_fts_delete AFTER DELETE ON experiment BEGIN
+            INSERT INTO experiment_fts(experiment_fts, rowid, title, hypothesis, protocol, analysis)
+            VALUES ('delete', old.id, old.title, old.hypothesis, old.protocol, old.analysis);
+        END
+    """))
+    # Version bumps and other column updates don't touch the index
+    conn.execute(text("""
+        CREATE TRIGGER experiment_fts_update AFTER UPDATE OF title, hypothesis, protocol, analysis ON experiment BEGIN
+            INSERT INTO experiment_fts(experiment_fts, rowid, title, hypothesis, protocol, analysis)
+            VALUES ('delete', old.id, old.title, old.hypothesis, old.protocol, old.analysis);
+            INSERT INTO experiment_fts(rowid, title, hypothesis, protocol, analysis)
+            VALUES (new.id, new.title, new.hypothesis, new.protocol, new.analysis);
+        END
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER experiment_log_fts_insert AFTER INSERT ON experiment_log BEGIN
+            INSERT INTO experiment_log_fts(rowid, content) VALUES (new.id, new.content);
+        END
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER experiment_log_fts_delete AFTER DELETE ON experiment_log BEGIN
+            INSERT INTO experiment_log_fts(experiment_log_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER experiment_log_fts_update AFTER UPDATE OF content ON experiment_log BEGIN
+            INSERT INTO experiment_log_fts(experiment_log_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO experiment_log_fts(rowid, content) VALUES (new.id, new.content);
+        END
+    """))
+    conn.execute(text("INSERT INTO experiment_fts(experiment_fts) VALUES ('rebuild')"))
+    conn.execute(text("INSERT INTO experiment_log_fts(experiment_log_fts) VALUES ('rebuild')"))
+
+def add_tombstone_viewer(conn):
+    columns = [col['name'] for col in inspect(conn).get_columns('tombstone')]
+    if 'viewer_id' not in columns:
+        conn.execute(text("ALTER TABLE tombstone ADD COLUMN viewer_id INTEGER"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_tombstone_viewer_deleted ON tombstone (viewer_id, date_deleted, id)"))
+
+def add_cleanup_job_backoff(conn):
+    columns = [col['name'] for col in inspect(conn).get_columns('storage_cleanup_job')]
+    if 'next_attempt_at' not in columns:
+        column_type = 'TIMESTAMP' if conn.dialect.name == 'postgresql' else 'DATETIME'
+        conn.execute(text(f"ALTER TABLE storage_cleanup_job ADD COLUMN next_attempt_at {column_type}"))
+
+def add_upload_session_status(conn):
+    columns = [col['name'] for col in inspect(conn).get_columns('upload_session')]
+    if 'status' not in columns:
+        conn.execute(text("ALTER TABLE upload_session ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT 'open'"))
+
+# (version, description, step) in the order they are applied; never renumber or edit a released
+# step, append a new one instead
+MIGRATIONS = [
+    (1, 'Create missing tables', create_missing_tables),
+    (2, 'Add user.current_group_id', add_user_current_group),
+    (3, 'Add experiment.version', add_experiment_version),
+    (4, 'Add group.version', add_group_version),
+    (5, 'Add experiment_file.content_hash and widen file_size', add_file_content_hash),
+    (6, 'Add date_updated to synced tables', add_sync_date_updated),
+    (7, 'Create query indexes', create_query_indexes),
+    (8, 'Create full-text search index', create_search_index),
+    (9, 'Add tombstone.viewer_id', add_tombstone_viewer),
+    (10, 'Add storage_cleanup_job.next_attempt_at', add_cleanup_job_backoff),
+    (11, 'Add upload_session.status', add_upload_session_status),
+]
+
+def applied_schema_version():
+    """Highest migration version recorded in the database (0 if it was never migrated by this runner)"""
+    with db.engine.connect() as conn:
+        try:
+            return conn.scalar(db.select(db.func.max(SchemaMigration.version))) or 0
+        except (OperationalError, ProgrammingError):
+            # No schema_migration table yet
+            return 0
+
+def upgrade_database():
+    """Apply pending migrations in order; returns the versions applied"""
+    current = applied_schema_version()
+    applied = []
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        print(f"Applying migration {version}: {description}...")
+        with db.engine.begin() as conn:
+            step(conn)
+            conn.execute(db.insert(SchemaMigration).values(version=version, description=description, date_applied=datetime.now()))
+        applied.append(version)
+    return applied
+
+@app.cli.command('db-upgrade')
+def db_upgrade_command():
+    """Apply pending schema migrations"""
+    applied = upgrade_database()
+    if applied:
+        print(f"Database upgraded to version {applied[-1]} ({len(applied)} migrations applied)")
     else:
-        print("All indexes already exist")
+        print(f"Database is up to date (version {MIGRATIONS[-1][0]})")
+
+@app.cli.command('db-version')
+def db_version_command():
+    """Show the applied schema version and any pending migrations"""
+    current = applied_schema_version()
+    print(f"Database version {current}, latest {MIGRATIONS[-1][0]}")
+    for version, description, _ in MIGRATIONS:
+        if version > current:
+            print(f"  Pending {version}: {description}")
 
-# Initialize database tables on startup (runs for both local and Cloud Run/gunicorn)
-# This runs when the module is imported, which happens before gunicorn starts the app
-with app.app_context():
+@app.cli.command('build-css')
+def build_css_command():
+    """Compile static/styles.scss into static/styles.css (run at build time, not in workers)"""
     try:
-        db.create_all()
-        migrate_database()
-        print("✅ Database tables initialized successfully")
-    except Exception as e:
-        print(f"⚠️ Warning: Database initialization error: {e}")
-        # Don't fail startup - tables might already exist or connection might fail
+        import sass
+    except ImportError:
+        raise RuntimeError("build-css requires libsass (pip install libsass)")
+    source = os.path.join(app.static_folder, 'styles.scss')
+    target = os.path.join(app.static_folder, 'styles.css')
+    css = sass.compile(filename=source, output_style='expanded')
+    with open(target, 'w') as out:
+        out.write(css)
+    print(f"Compiled {source} -> {target} ({len(css)} bytes)")
+
+@app.cli.command('storage-gc')
+def storage_gc_command():
+    """Run due storage cleanup jobs, then delete stored data that no row references"""
+    completed = run_storage_cleanup()
+    print(f"Completed {completed} queued cleanup jobs")
+    abandoned = collect_abandoned_blobs()
+    print(f"Removed {len(abandoned)} unreferenced blobs whose cleanup jobs gave up")
+    removed = collect_orphaned_files(app.config['STORAGE_GC_GRACE_SECONDS'])
+    print(f"Removed {len(removed)} orphaned files")
+
+@app.cli.command('prune')
+def prune_command():
+    """Delete change events and sync tombstones past their retention"""
+    for table, removed in prune_expired_records().items():
+        print(f"Removed {removed} expired {table}")
+
+# Password hashing pool processes re-import this file as '__mp_main__' when it is run directly
+# (python app.py); they only call werkzeug.security, so the startup work below is skipped there
+is_pool_worker_import = __name__ == '__mp_main__'
+
+# Apply pending migrations on startup when AUTO_MIGRATE is on (this runs when the module is
+# imported, before gunicorn starts the app); an up-to-date database costs one version query
+if app.config['AUTO_MIGRATE'] and not is_pool_worker_import:
+    with app.app_context(), startup_profile.phase('migrations'):
+        try:
+            if upgrade_database():
+                print("✅ Database schema upgraded successfully")
+        except Exception as e:
+            print(f"⚠️ Warning: Database migration error: {e}")
+            # Don't fail startup - the connection might not be available yet
+
+if startup_profile.enabled and not is_pool_worker_import:
+    startup_profile.report()
+
+    # Time to first request: the first request usually pays for lazily created state as well
+    # (database connections, the Jinja environment), so it is reported separately
+    @app.before_request
+    def start_first_request_profile():
+        if startup_profile.first_request_started is None:
+            startup_profile.first_request_started = time.perf_counter()
+            g.profile_first_request = True
+
+    @app.after_request
+    def report_first_request_profile(response):
+        if g.pop('profile_first_request', False):
+            now = time.perf_counter()
+            print(
+                f"Startup profile: first request {request.method} {request.path} took "
+                f"{(now - startup_profile.first_request_started) * 1000:.1f} ms; "
+                f"{(now - startup_profile.started) * 1000:.1f} ms from import to first response"
+            )
+        return response
 
 if __name__ == '__main__':
     # Get port from environment variable (required for Cloud Run)
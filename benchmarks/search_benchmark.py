@@ -0,0 +1,114 @@
+"""Search latency on a large synthetic lab: 10k experiments and 1M logs by default
+
+Builds the data set in a throwaway SQLite database (unless DATABASE_URL points elsewhere),
+then times GET /api/search for common, rare, multi-word and prefix queries in both scopes.
+
+    python benchmarks/search_benchmark.py [--logs 1000000] [--experiments 10000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+if 'DATABASE_URL' not in os.environ:
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='lab-app-bench-'), 'bench.db')
+os.environ.setdefault('RESULT_CACHE_BACKEND', 'none')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app as lab_app  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+USERS = 50
+GROUP_MEMBERS = 10
+LOG_BATCH_SIZE = 10000
+RUNS = 5
+
+
+def populate(engine, experiments, logs, vocab):
+    """Insert users, one shared group and the experiments and logs (FTS triggers included)"""
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]  # Zipf-like word frequencies
+
+    def words(count):
+        return ' '.join(random.choices(vocab, weights, k=count))
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO user (email, password_hash, name) VALUES (:email, 'x', :name)"),
+            [{'email': f'u{u}@example.com', 'name': f'User {u}'} for u in range(1, USERS + 1)]
+        )
+        conn.execute(text("INSERT INTO \"group\" (name, code, created_by_id, version) VALUES ('Bench', 'BENCH1', 1, 1)"))
+        conn.execute(
+            text("INSERT INTO group_member (group_id, user_id) VALUES (1, :user_id)"),
+            [{'user_id': u} for u in range(1, GROUP_MEMBERS + 1)]
+        )
+        conn.execute(
+            text(
+                "INSERT INTO experiment (exp_id, title, status, start_date, owner_id, hypothesis, protocol, analysis,"
+                " version, date_created, date_updated)"
+                " VALUES (:exp_id, :title, 'Planning', '2024-01-01', :owner_id, :hypothesis, '', '', 1,"
+                " CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ),
+            [
+                {'exp_id': f'EXP-{i}', 'title': words(5), 'hypothesis': words(30), 'owner_id': 1 + i % USERS}
+                for i in range(experiments)
+            ]
+        )
+    started = time.perf_counter()
+    for start in range(0, logs, LOG_BATCH_SIZE):
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO experiment_log (experiment_id, timestamp, content, date_created, date_updated)"
+                    " VALUES (:experiment_id, '2024-01-01 00:00', :content, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+                ),
+                [
+                    {'experiment_id': 1 + random.randrange(experiments), 'content': words(12)}
+                    for _ in range(min(LOG_BATCH_SIZE, logs - start))
+                ]
+            )
+    print(f'Inserted {logs} logs in {time.perf_counter() - started:.1f}s')
+
+
+def time_search(client, query, scope):
+    """Median latency in ms and the response of GET /api/search over RUNS requests"""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        response = client.get('/api/search', query_string={'q': query, 'scope': scope})
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[RUNS // 2] * 1000, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logs', type=int, default=1000000)
+    parser.add_argument('--experiments', type=int, default=10000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    vocab = [''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=random.randint(4, 9))) for _ in range(20000)]
+    with lab_app.app.app_context():
+        populate(lab_app.db.engine, args.experiments, args.logs, vocab)
+
+    client = lab_app.app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+    queries = {
+        'most common word': vocab[0],
+        'common word': vocab[50],
+        'rare word': vocab[5000],
+        'very rare word': vocab[19000],
+        'two words': f'{vocab[3]} {vocab[40]}',
+        'prefix': vocab[200][:3],
+    }
+    for label, query in queries.items():
+        for scope in ('group', 'user'):
+            median_ms, response = time_search(client, query, scope)
+            assert response.status_code == 200, response.get_json()
+            print(f'{label:>16} ({scope:>5}): {len(response.get_json()["results"]):3d} hits, median {median_ms:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Sidebar } from './components/Sidebar';
 import { ProfileEditModal } from './components/ProfileEditModal';
 import { GroupManagementModal } from './components/GroupManagementModal';
@@ -8,7 +8,10 @@ import { DashboardPage } from './pages/DashboardPage';
 import { ExperimentListPage } from './pages/ExperimentListPage';
 import { NewExperimentPage } from './pages/NewExperimentPage';
 import { ExperimentDetailPage } from './pages/ExperimentDetailPage';
-import { authAPI, experimentsAPI, groupsAPI } from './services/api';
+import { authAPI, experimentsAPI, groupsAPI, changesAPI } from './services/api';
+
+// Bursts of change events (e.g. a batch of logs) refresh the dashboard counts once
+const STATS_REFRESH_DELAY_MS = 1000;
 
 export default function App() {
   // Authentication state
@@ -22,9 +25,16 @@ export default function App() {
 
   // App state
   const [currentPage, setCurrentPage] = useState('dashboard'); // 'dashboard', 'experiments', 'new', 'detail'
-  const [experiments, setExperiments] = useState([]); // User's experiments (for dashboard)
+  const [stats, setStats] = useState(null); // Aggregates for the user's experiments (for dashboard)
   const [groupExperiments, setGroupExperiments] = useState([]); // Group experiments (for experiments list page)
   const [selectedExperiment, setSelectedExperiment] = useState(null);
+  // Read by the change feed handler, which is subscribed once and would otherwise see stale state
+  const selectedExperimentRef = useRef(null);
+  const statsRefreshTimer = useRef(null);
+
+  useEffect(() => {
+    selectedExperimentRef.current = selectedExperiment;
+  }, [selectedExperiment]);
 
   // Check for existing session on mount
   useEffect(() => {
@@ -45,6 +55,54 @@ export default function App() {
     checkSession();
   }, []);
 
+  // Follow the change feed while signed in instead of refetching whole lists
+  useEffect(() => {
+    if (!isAuthenticated) return undefined;
+    const unsubscribe = changesAPI.subscribe(applyChange);
+    return () => {
+      unsubscribe();
+      clearTimeout(statsRefreshTimer.current);
+    };
+  }, [isAuthenticated]);
+
+  // Refresh dashboard counts once events stop arriving for STATS_REFRESH_DELAY_MS
+  const scheduleStatsRefresh = () => {
+    clearTimeout(statsRefreshTimer.current);
+    statsRefreshTimer.current = setTimeout(loadStats, STATS_REFRESH_DELAY_MS);
+  };
+
+  // Apply one change event: list rows come from the event itself; only an open experiment
+  // that the event makes out of date is refetched
+  const applyChange = async (change) => {
+    if (change.type === 'resync' || change.type.startsWith('membership.')) {
+      // Visibility changed (or too many events were missed): reload the lists and counts
+      await loadCurrentGroup();
+      await loadExperiments();
+      return;
+    }
+    scheduleStatsRefresh();
+    if (change.type === 'experiment.deleted') {
+      setGroupExperiments(prev => prev.filter(exp => exp.id !== change.expId));
+      setSelectedExperiment(prev => (prev && prev.id === change.expId ? null : prev));
+      return;
+    }
+    if (change.experiment) {
+      // experiment.created / experiment.updated carry the summary row the list renders
+      const summary = change.experiment;
+      setGroupExperiments(prev => (prev.some(exp => exp.id === summary.id)
+        ? prev.map(exp => (exp.id === summary.id ? { ...exp, ...summary } : exp))
+        : [summary, ...prev]));
+    }
+    const selected = selectedExperimentRef.current;
+    if (!selected || selected.id !== change.expId || selected.version >= change.version) return;
+    try {
+      const updated = await experimentsAPI.getById(change.expId);
+      setSelectedExperiment(prev => (prev && prev.id === updated.id ? updated : prev));
+    } catch (err) {
+      console.error('Failed to apply change:', err);
+    }
+  };
+
   // Load current group
   const loadCurrentGroup = async () => {
     try {
@@ -56,15 +114,23 @@ export default function App() {
     }
   };
 
+  // Load dashboard statistics from API
+  const loadStats = async () => {
+    try {
+      setStats(await experimentsAPI.getStats('user'));
+    } catch (err) {
+      console.error('Failed to load statistics:', err);
+    }
+  };
+
   // Load experiments from API
   const loadExperiments = async () => {
     try {
-      // Load user's experiments (for dashboard)
-      const userExps = await experimentsAPI.getAll('user');
-      setExperiments(userExps);
+      // Load dashboard statistics (counts and recent activity are aggregated server-side)
+      await loadStats();
       
-      // Load group experiments (for experiments list page)
-      const groupExps = await experimentsAPI.getAll('group');
+      // Load group experiments (for experiments list page; summary fields are enough there)
+      const groupExps = await experimentsAPI.getAll('group', 'summary');
       setGroupExperiments(groupExps);
     } catch (err) {
       console.error('Failed to load experiments:', err);
@@ -94,7 +160,7 @@ export default function App() {
     setIsAuthenticated(false);
     setUser(null);
     setSelectedExperiment(null);
-    setExperiments([]);
+    setStats(null);
     setGroupExperiments([]);
     setCurrentPage('dashboard');
   };
@@ -121,7 +187,6 @@ export default function App() {
   const handleAddExperiment = async (newExperiment) => {
     try {
       const created = await experimentsAPI.create(newExperiment);
-      setExperiments([created, ...experiments]);
       // Also add to group experiments if user is in a group
       setGroupExperiments(prev => {
         // Check if experiment already exists to avoid duplicates
@@ -150,11 +215,6 @@ export default function App() {
         updated = await experimentsAPI.update(id, updatesOrExperiment);
       }
       
-    setExperiments(prevExperiments =>
-      prevExperiments.map(exp => 
-          exp.id === id ? updated : exp
-        )
-      );
     // Also update in group experiments if it exists there
     setGroupExperiments(prevExperiments =>
       prevExperiments.map(exp => 
@@ -178,8 +238,6 @@ export default function App() {
 
     try {
       await experimentsAPI.delete(id);
-      // Remove from user's experiments list
-      setExperiments(prevExperiments => prevExperiments.filter(exp => exp.id !== id));
       // Remove from group experiments list
       setGroupExperiments(prevExperiments => prevExperiments.filter(exp => exp.id !== id));
       // If the deleted experiment was selected, navigate away
@@ -228,7 +286,7 @@ export default function App() {
     }
     // Default to dashboard
     return <DashboardPage 
-              experiments={experiments}
+              stats={stats}
               onSelectExperiment={handleSelectExperiment}
               user={user}
             />;
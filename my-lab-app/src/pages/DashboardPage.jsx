@@ -1,4 +1,4 @@
-import React, { useMemo } from 'react';
+import React from 'react';
 import { StatCard } from '../components/StatCard';
 import { StatusTag } from '../components/StatusTag';
 import { IconClock, IconCheckCircle, IconXCircle } from '../components/icons';
@@ -6,19 +6,10 @@ import { IconClock, IconCheckCircle, IconXCircle } from '../components/icons';
 /**
  * The main landing page (Dashboard) - shown after login
  */
-export const DashboardPage = ({ experiments, onSelectExperiment, user }) => {
-  const stats = useMemo(() => {
-    return experiments.reduce((acc, exp) => {
-      if (exp.status === 'In Progress') acc.inProgress += 1;
-      else if (exp.status === 'Completed') acc.completed += 1;
-      else if (exp.status === 'Failed') acc.failed += 1;
-      return acc;
-    }, { inProgress: 0, completed: 0, failed: 0 });
-  }, [experiments]);
-
-  const recentExperiments = [...experiments]
-    .sort((a, b) => new Date(b.logs[b.logs.length - 1]?.timestamp || b.startDate) - new Date(a.logs[a.logs.length - 1]?.timestamp || a.startDate))
-    .slice(0, 5);
+export const DashboardPage = ({ stats, onSelectExperiment, user }) => {
+  // Counts and recent activity come aggregated from /api/stats
+  const byStatus = stats?.byStatus || {};
+  const recentExperiments = stats?.recent || [];
 
   return (
     <div className="p-8">
@@ -31,19 +22,19 @@ export const DashboardPage = ({ experiments, onSelectExperiment, user }) => {
       <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mt-8">
         <StatCard 
           title="In Progress" 
-          value={stats.inProgress} 
+          value={byStatus['In Progress'] || 0} 
           icon={<IconClock className="w-6 h-6" />}
           color={{ bg: 'bg-blue-100', text: 'text-blue-700' }} 
         />
         <StatCard 
           title="Completed" 
-          value={stats.completed}
+          value={byStatus['Completed'] || 0}
           icon={<IconCheckCircle className="w-6 h-6" />}
           color={{ bg: 'bg-green-100', text: 'text-green-700' }}
         />
         <StatCard 
           title="Failed" 
-          value={stats.failed}
+          value={byStatus['Failed'] || 0}
           icon={<IconXCircle className="w-6 h-6" />}
           color={{ bg: 'bg-red-100', text: 'text-red-700' }}
         />
@@ -63,7 +54,7 @@ export const DashboardPage = ({ experiments, onSelectExperiment, user }) => {
                 <div className="flex-1 min-w-0">
                   <p className="text-sm font-medium text-indigo-600 truncate">{exp.title}</p>
                   <p className="text-sm text-gray-500 mt-1">
-                    Last log: {exp.logs.length > 0 ? exp.logs[exp.logs.length - 1].content : 'No logs yet'}
+                    Last log: {exp.lastLog ? exp.lastLog.content : 'No logs yet'}
                   </p>
                 </div>
                 <div className="flex-shrink-0 ml-4">
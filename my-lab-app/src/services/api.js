@@ -156,10 +156,15 @@ export const groupsAPI = {
 
 // Experiments API
 export const experimentsAPI = {
-  async getAll(scope = 'user') {
+  async getAll(scope = 'user', fields = 'full') {
     // scope can be 'user' (default) or 'group'
-    const url = scope === 'group' 
-      ? `${API_BASE_URL}/experiments?scope=group`
+    // fields can be 'full' (default) or 'summary' (id, title, status, owner, startDate only)
+    const params = new URLSearchParams();
+    if (scope === 'group') params.set('scope', 'group');
+    if (fields === 'summary') params.set('fields', 'summary');
+    const query = params.toString();
+    const url = query
+      ? `${API_BASE_URL}/experiments?${query}`
       : `${API_BASE_URL}/experiments`;
     const response = await fetch(url, {
       credentials: 'include',
@@ -169,6 +174,14 @@ export const experimentsAPI = {
     return Array.isArray(data) ? data : (data.experiments || []);
   },
 
+  async getStats(scope = 'user') {
+    // Counts by status and owner plus recent activity, aggregated by the server
+    const response = await fetch(`${API_BASE_URL}/stats?scope=${scope}`, {
+      credentials: 'include',
+    });
+    return handleResponse(response);
+  },
+
   async getById(expId) {
     const response = await fetch(`${API_BASE_URL}/experiments/${expId}`, {
       credentials: 'include',
@@ -223,6 +236,16 @@ export const experimentsAPI = {
     });
     return handleResponse(response);
   },
+
+  async search(q, { scope = 'group', type = 'all', cursor = null } = {}) {
+    // Ranked full-text matches in experiments and logs; pass nextCursor back for the next page
+    const params = new URLSearchParams({ q, scope, type });
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`${API_BASE_URL}/search?${params}`, {
+      credentials: 'include',
+    });
+    return handleResponse(response);
+  },
 };
 
 // Files API
@@ -254,3 +277,41 @@ export const filesAPI = {
   },
 };
 
+// Change feed (Server-Sent Events)
+// EventSource gives up on an error status such as the 503 sent when a server worker has no
+// stream slots left; reopen it after this long, resuming from the last event received
+const CHANGES_REOPEN_DELAY_MS = 30000;
+
+export const changesAPI = {
+  // Calls onChange with each change event for the user's experiments and groups; returns an unsubscribe function
+  subscribe(onChange) {
+    let source = null;
+    let reopenTimer = null;
+    let lastEventId = null;
+    const open = () => {
+      // Without an event id to resume from, events may have been missed while closed
+      let needsResync = source !== null && !lastEventId;
+      // EventSource reconnects by itself after dropped connections and resumes from the last event id
+      const query = lastEventId ? `?lastEventId=${encodeURIComponent(lastEventId)}` : '';
+      source = new EventSource(`${API_BASE_URL}/events${query}`, { withCredentials: true });
+      source.onopen = () => {
+        if (needsResync) onChange({ type: 'resync' });
+        needsResync = false;
+      };
+      source.onmessage = (message) => {
+        if (message.lastEventId) lastEventId = message.lastEventId;
+        onChange(JSON.parse(message.data));
+      };
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) {
+          reopenTimer = setTimeout(open, CHANGES_REOPEN_DELAY_MS);
+        }
+      };
+    };
+    open();
+    return () => {
+      clearTimeout(reopenTimer);
+      source.close();
+    };
+  },
+};
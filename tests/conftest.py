@@ -0,0 +1,104 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# app.py reads its configuration at import time: point it at a throwaway database and upload
+# folder, and turn off the caches so every request reaches the database
+TEST_ROOT = tempfile.mkdtemp(prefix='lab-app-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(TEST_ROOT, 'test.db')
+os.environ['UPLOAD_FOLDER'] = os.path.join(TEST_ROOT, 'uploads')
+os.environ['RESULT_CACHE_BACKEND'] = 'none'
+os.environ['AUTH_CACHE_TTL'] = '0'
+os.environ['PASSWORD_HASH_WORKERS'] = '0'
+os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'  # Fast hashes for test users
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app as lab_app  # noqa: E402
+
+
+class StatementCounter:
+    """SQL statements sent to the database by the current thread while counting"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __len__(self):
+        return len(self.statements)
+
+    def __str__(self):
+        return '\n'.join(self.statements)
+
+
+@pytest.fixture
+def count_queries():
+    """Context manager factory counting the statements a block executes (background workers excluded)"""
+    with lab_app.app.app_context():
+        engine = lab_app.db.engine
+
+    @contextmanager
+    def counting():
+        counter = StatementCounter()
+        thread_id = threading.get_ident()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if threading.get_ident() == thread_id:
+                counter.statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+
+    return counting
+
+
+@pytest.fixture
+def new_client():
+    """Factory for test clients signed in as a newly registered user"""
+    def make():
+        client = lab_app.app.test_client()
+        email = f'{uuid.uuid4().hex[:12]}@example.com'
+        response = client.post('/api/register', json={'email': email, 'password': 'password', 'name': email[:6]})
+        assert response.status_code == 201
+        client.user_id = response.get_json()['user']['id']
+        return client
+    return make
+
+
+@pytest.fixture
+def client(new_client):
+    return new_client()
+
+
+def create_experiment(client, logs=0, files=0):
+    """Create an experiment with the given number of logs and files; returns its exp_id"""
+    exp_id = f'EXP-{uuid.uuid4().hex[:12]}'
+    assert client.post('/api/experiments', json={'id': exp_id, 'title': 'Test'}).status_code == 201
+    if logs:
+        response = client.post(f'/api/experiments/{exp_id}/logs/batch', json={
+            'logs': [{'timestamp': f'2024-01-01 {i:02d}:00', 'content': f'entry {i}'} for i in range(logs)]
+        })
+        assert response.status_code == 201
+    for i in range(files):
+        upload_file(client, exp_id, f'{exp_id} file {i}'.encode())
+    return exp_id
+
+
+def upload_file(client, exp_id, content):
+    """Upload content as a file to exp_id; returns the response"""
+    response = client.post(
+        f'/api/experiments/{exp_id}/files',
+        data={'file': (io.BytesIO(content), 'data.txt')},
+        content_type='multipart/form-data',
+        headers={'Prefer': 'return=minimal'}
+    )
+    assert response.status_code == 201
+    return response
@@ -0,0 +1,42 @@
+"""Password hashing on register and login"""
+import uuid
+
+from werkzeug.security import generate_password_hash
+
+from conftest import lab_app
+
+db = lab_app.db
+
+
+def stored_hash(email):
+    with lab_app.app.app_context():
+        return db.session.scalar(db.select(lab_app.User.password_hash).where(lab_app.User.email == email))
+
+
+def set_stored_hash(email, password_hash):
+    with lab_app.app.app_context():
+        db.session.execute(db.update(lab_app.User).where(lab_app.User.email == email).values(password_hash=password_hash))
+        db.session.commit()
+
+
+def test_login_upgrades_weaker_hashes():
+    client = lab_app.app.test_client()
+    email = f'{uuid.uuid4().hex[:12]}@example.com'
+    assert client.post('/api/register', json={'email': email, 'password': 'password', 'name': 'Rehash'}).status_code == 201
+    method = lab_app.app.config['PASSWORD_HASH_METHOD']
+    assert stored_hash(email).startswith(f'{method}$')
+
+    # A hash from before PASSWORD_HASH_METHOD was raised
+    weaker = generate_password_hash('password', 'pbkdf2:sha256:500')
+    set_stored_hash(email, weaker)
+    assert client.post('/api/login', json={'email': email, 'password': 'wrong'}).status_code == 401
+    assert stored_hash(email) == weaker
+
+    assert client.post('/api/login', json={'email': email, 'password': 'password'}).status_code == 200
+    upgraded = stored_hash(email)
+    assert upgraded.startswith(f'{method}$')
+    assert lab_app.verify_password(upgraded, 'password')
+
+    # Hashes already made with the current method are left alone
+    assert client.post('/api/login', json={'email': email, 'password': 'password'}).status_code == 200
+    assert stored_hash(email) == upgraded
@@ -0,0 +1,29 @@
+"""Change feed streams (GET /api/events)"""
+from conftest import lab_app
+
+
+def open_stream(client):
+    """Start an event stream and read its first message so the stream is running"""
+    response = client.get('/api/events', buffered=False)
+    if response.status_code == 200:
+        next(response.response)
+    return response
+
+
+def test_streams_per_worker_are_capped(new_client, monkeypatch):
+    monkeypatch.setitem(lab_app.app.config, 'CHANGE_FEED_MAX_STREAMS', 2)
+    first, second, third = new_client(), new_client(), new_client()
+    streams = [open_stream(first), open_stream(second)]
+    assert [stream.status_code for stream in streams] == [200, 200]
+
+    refused = open_stream(third)
+    assert refused.status_code == 503
+    assert refused.headers['Retry-After'] == str(lab_app.CHANGE_FEED_RETRY_AFTER_SECONDS)
+
+    # A closed stream frees its slot
+    streams[0].close()
+    reopened = open_stream(third)
+    assert reopened.status_code == 200
+    reopened.close()
+    streams[1].close()
+    assert lab_app.change_feed.stream_count == 0
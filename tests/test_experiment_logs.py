@@ -0,0 +1,97 @@
+"""Log lists sent with PUT /api/experiments/<id> (sync_experiment_logs)"""
+import re
+
+import pytest
+
+from conftest import create_experiment, lab_app
+from test_query_counts import QUERY_LIMITS
+
+
+def get_logs(client, exp_id):
+    return client.get(f'/api/experiments/{exp_id}').get_json()['experiment']['logs']
+
+
+def put_logs(client, exp_id, logs):
+    return client.put(f'/api/experiments/{exp_id}', json={'logs': logs})
+
+
+def add_logs(client, exp_id, count):
+    """Add count logs through the batch endpoint, in batches it accepts"""
+    for start in range(0, count, lab_app.MAX_LOG_BATCH_SIZE):
+        response = client.post(f'/api/experiments/{exp_id}/logs/batch', json={'logs': [
+            {'timestamp': f'2024-01-01 {i:05d}', 'content': f'entry {i}'}
+            for i in range(start, min(start + lab_app.MAX_LOG_BATCH_SIZE, count))
+        ]})
+        assert response.status_code == 201
+
+
+def log_tombstones(exp_id):
+    with lab_app.app.app_context():
+        return sorted(lab_app.db.session.scalars(
+            lab_app.db.select(lab_app.Tombstone.record_id)
+            .where(lab_app.Tombstone.kind == 'log', lab_app.Tombstone.exp_id == exp_id)
+        ))
+
+
+def test_logs_with_ids_are_updated_in_place(client):
+    exp_id = create_experiment(client, logs=3)
+    logs = get_logs(client, exp_id)
+    logs[1]['content'] = 'edited'
+    assert put_logs(client, exp_id, logs).status_code == 200
+
+    stored = get_logs(client, exp_id)
+    assert [log['id'] for log in stored] == [log['id'] for log in logs]
+    assert [log['content'] for log in stored] == ['entry 0', 'edited', 'entry 2']
+
+
+def test_logs_without_ids_match_unchanged_rows(client):
+    exp_id = create_experiment(client, logs=3)
+    before = get_logs(client, exp_id)
+    echoed = [{'timestamp': log['timestamp'], 'content': log['content']} for log in before]
+    echoed.append({'timestamp': '2024-01-02 00:00', 'content': 'new'})
+    assert put_logs(client, exp_id, echoed).status_code == 200
+
+    after = get_logs(client, exp_id)
+    assert [log['id'] for log in after[:3]] == [log['id'] for log in before]
+    assert after[3]['content'] == 'new' and after[3]['id'] not in {log['id'] for log in before}
+    assert log_tombstones(exp_id) == []
+
+
+def test_removed_logs_are_deleted_with_tombstones(client):
+    exp_id = create_experiment(client, logs=3)
+    logs = get_logs(client, exp_id)
+    assert put_logs(client, exp_id, [logs[0], logs[2]]).status_code == 200
+
+    assert [log['id'] for log in get_logs(client, exp_id)] == [logs[0]['id'], logs[2]['id']]
+    assert log_tombstones(exp_id) == [logs[1]['id']]
+
+
+@pytest.mark.parametrize('logs', [
+    'not a list',
+    ['not an object'],
+    [{'timestamp': '2024-01-01 00:00'}],
+    [{'timestamp': 1, 'content': 'x'}],
+    [{'timestamp': '2024-01-01 00:00', 'content': None}],
+    [{'id': 'abc', 'timestamp': '2024-01-01 00:00', 'content': 'x'}],
+    [{'id': True, 'timestamp': '2024-01-01 00:00', 'content': 'x'}],
+])
+def test_malformed_log_lists_are_rejected(client, logs):
+    exp_id = create_experiment(client, logs=2)
+    before = get_logs(client, exp_id)
+    response = put_logs(client, exp_id, logs)
+    assert response.status_code == 400
+    assert get_logs(client, exp_id) == before
+
+
+def test_unchanged_log_list_writes_no_log_rows(client, count_queries):
+    exp_id = create_experiment(client)
+    add_logs(client, exp_id, 5000)
+    logs = get_logs(client, exp_id)
+    with count_queries() as counter:
+        assert put_logs(client, exp_id, logs).status_code == 200
+    log_writes = [
+        statement for statement in counter.statements
+        if re.match(r'\s*(INSERT INTO|UPDATE|DELETE FROM) experiment_log\b', statement)
+    ]
+    assert log_writes == []
+    assert len(counter) <= QUERY_LIMITS['update']
@@ -0,0 +1,159 @@
+"""SQL statements per request for the hot endpoints
+
+Each endpoint has a statement budget, and its count must not grow with the number of
+experiments, logs, files or shared groups involved (no N+1 loading). If a change legitimately needs another
+statement, raise the budget in the same commit and say why.
+"""
+import io
+
+from conftest import create_experiment
+
+QUERY_LIMITS = {
+    'list': 5,  # id/version validator query, then the page with its logs and files
+    'list_not_modified': 2,  # Revalidation stops after the validator query
+    'group_list': 6,  # The list budget plus one query for the co-member owner ids
+    'detail': 3,
+    'update': 11,
+    'add_log': 9,
+    'upload': 14,
+    'co_member_detail': 3,
+    'co_member_download': 1,
+}
+# Small and large data sets (or group counts); the statement count must be the same for both
+SIZES = (1, 10)
+# Groups the listing user belongs to, each with another owner's experiment
+GROUP_COUNTS = (1, 5, 12)
+
+
+def assert_within_budget(endpoint, counters):
+    """Fail if any counted request exceeded its budget or if counts differ between data sizes"""
+    counts = [len(counter) for counter in counters]
+    for counter in counters:
+        assert len(counter) <= QUERY_LIMITS[endpoint], (
+            f'{endpoint} ran {len(counter)} statements (budget {QUERY_LIMITS[endpoint]}):\n{counter}'
+        )
+    assert len(set(counts)) == 1, f'{endpoint} statement count grows with data size: {counts}\n{counters[-1]}'
+
+
+def test_list_experiments(new_client, count_queries):
+    counters = []
+    for size in SIZES:
+        client = new_client()
+        for _ in range(size):
+            create_experiment(client, logs=size, files=size)
+        with count_queries() as counter:
+            response = client.get('/api/experiments')
+        assert response.status_code == 200
+        assert len(response.get_json()) == size
+        counters.append(counter)
+    assert_within_budget('list', counters)
+
+
+def test_list_experiments_not_modified(new_client, count_queries):
+    counters = []
+    for size in SIZES:
+        client = new_client()
+        for _ in range(size):
+            create_experiment(client, logs=size, files=size)
+        etag = client.get('/api/experiments').headers['ETag']
+        with count_queries() as counter:
+            response = client.get('/api/experiments', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        counters.append(counter)
+    assert_within_budget('list_not_modified', counters)
+
+
+def test_list_group_experiments_independent_of_group_count(new_client, count_queries):
+    counters = []
+    for group_count in GROUP_COUNTS:
+        reader = new_client()
+        for i in range(group_count):
+            owner = new_client()
+            code = owner.post('/api/groups', json={'name': f'Group {i}'}).get_json()['group']['code']
+            assert reader.post('/api/groups/join', json={'code': code}).status_code == 200
+            create_experiment(owner, logs=1, files=1)
+        with count_queries() as counter:
+            response = reader.get('/api/experiments?scope=group')
+        assert response.status_code == 200
+        assert len(response.get_json()) == group_count
+        counters.append(counter)
+    assert_within_budget('group_list', counters)
+
+
+def test_get_experiment(client, count_queries):
+    counters = []
+    for size in SIZES:
+        exp_id = create_experiment(client, logs=size, files=size)
+        with count_queries() as counter:
+            response = client.get(f'/api/experiments/{exp_id}')
+        assert response.status_code == 200
+        assert len(response.get_json()['experiment']['logs']) == size
+        counters.append(counter)
+    assert_within_budget('detail', counters)
+
+
+def test_update_experiment(client, count_queries):
+    counters = []
+    for size in SIZES:
+        exp_id = create_experiment(client, logs=size, files=size)
+        logs = client.get(f'/api/experiments/{exp_id}').get_json()['experiment']['logs']
+        logs[0]['content'] = 'edited'
+        with count_queries() as counter:
+            response = client.put(f'/api/experiments/{exp_id}', json={'title': 'Renamed', 'logs': logs})
+        assert response.status_code == 200
+        counters.append(counter)
+    assert_within_budget('update', counters)
+
+
+def test_add_log(client, count_queries):
+    counters = []
+    for size in SIZES:
+        exp_id = create_experiment(client, logs=size, files=size)
+        with count_queries() as counter:
+            response = client.post(f'/api/experiments/{exp_id}/logs', json={'timestamp': 'now', 'content': 'new'})
+        assert response.status_code == 201
+        assert len(response.get_json()['experiment']['logs']) == size + 1
+        counters.append(counter)
+    assert_within_budget('add_log', counters)
+
+
+def test_upload_file(client, count_queries):
+    counters = []
+    for size in SIZES:
+        exp_id = create_experiment(client, logs=size, files=size)
+        with count_queries() as counter:
+            response = client.post(
+                f'/api/experiments/{exp_id}/files',
+                data={'file': (io.BytesIO(exp_id.encode()), 'new.txt')},
+                content_type='multipart/form-data'
+            )
+        assert response.status_code == 201
+        assert len(response.get_json()['experiment']['files']) == size + 1
+        counters.append(counter)
+    assert_within_budget('upload', counters)
+
+
+def test_co_member_reads_independent_of_group_count(new_client, count_queries):
+    detail_counters = []
+    download_counters = []
+    for group_count in SIZES:
+        owner = new_client()
+        reader = new_client()
+        for i in range(group_count):
+            code = owner.post('/api/groups', json={'name': f'Group {i}'}).get_json()['group']['code']
+            assert reader.post('/api/groups/join', json={'code': code}).status_code == 200
+        exp_id = create_experiment(owner, logs=1, files=1)
+        file_id = owner.get(f'/api/experiments/{exp_id}').get_json()['experiment']['files'][0]['id']
+
+        with count_queries() as counter:
+            response = reader.get(f'/api/experiments/{exp_id}')
+        assert response.status_code == 200
+        detail_counters.append(counter)
+
+        with count_queries() as counter:
+            response = reader.get(f'/api/experiments/{exp_id}/files/{file_id}/download')
+        assert response.status_code == 200
+        response.close()
+        download_counters.append(counter)
+    assert_within_budget('co_member_detail', detail_counters)
+    assert_within_budget('co_member_download', download_counters)
@@ -0,0 +1,70 @@
+"""Full-text search: visibility, matching and ranked pagination"""
+from conftest import create_experiment, lab_app
+
+
+def search(client, q, **params):
+    response = client.get('/api/search', query_string={'q': q, **params})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def hit_ids(body):
+    return {(hit['type'], hit['experiment']['id']) for hit in body['results']}
+
+
+def test_search_respects_visibility(new_client):
+    owner = new_client()
+    member = new_client()
+    outsider = new_client()
+    code = owner.post('/api/groups', json={'name': 'Lab'}).get_json()['group']['code']
+    assert member.post('/api/groups/join', json={'code': code}).status_code == 200
+    exp_id = create_experiment(owner)
+    assert owner.put(f'/api/experiments/{exp_id}', json={'title': 'Zymurgy fermentation'}).status_code == 200
+    owner.post(f'/api/experiments/{exp_id}/logs', json={'timestamp': 'now', 'content': 'zymurgy yeast pitched'})
+
+    assert hit_ids(search(owner, 'zymurgy', scope='user')) == {('experiment', exp_id), ('log', exp_id)}
+    assert hit_ids(search(member, 'zymurgy')) == {('experiment', exp_id), ('log', exp_id)}
+    assert search(member, 'zymurgy', scope='user')['results'] == []
+    assert search(outsider, 'zymurgy')['results'] == []
+
+
+def test_search_matches_all_terms_and_last_as_prefix(client):
+    exp_id = create_experiment(client)
+    client.post(f'/api/experiments/{exp_id}/logs', json={'timestamp': 'now', 'content': 'centrifuged the lysate'})
+
+    [hit] = search(client, 'centrifuged lys', type='logs')['results']
+    assert hit['log']['timestamp'] == 'now'
+    assert '**lysate**' in hit['snippet']
+    assert search(client, 'centrif')['results']
+    assert search(client, 'centrifuged plasmid')['results'] == []
+
+
+def test_search_cursor_pages_through_ranked_results(client):
+    exp_id = create_experiment(client)
+    client.post(f'/api/experiments/{exp_id}/logs/batch', json={
+        'logs': [{'timestamp': f'2024-01-01 {i:02d}:00', 'content': f'titration run {i}'} for i in range(7)]
+    })
+    seen = []
+    cursor = None
+    while True:
+        body = search(client, 'titration', limit=3, **({'cursor': cursor} if cursor else {}))
+        seen += [hit['log']['id'] for hit in body['results']]
+        cursor = body['nextCursor']
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 7
+
+
+def test_search_cursor_offset_is_limited(client, monkeypatch):
+    exp_id = create_experiment(client)
+    client.post(f'/api/experiments/{exp_id}/logs/batch', json={
+        'logs': [{'timestamp': f'2024-01-01 {i:02d}:00', 'content': f'aliquot {i}'} for i in range(6)]
+    })
+    monkeypatch.setattr(lab_app, 'MAX_SEARCH_OFFSET', 4)
+    body = search(client, 'aliquot', limit=2, cursor=lab_app.encode_search_cursor(4))
+    assert len(body['results']) == 2
+    assert body['nextCursor'] is None  # More matches exist, but past the deepest allowed offset
+
+    for cursor in (lab_app.encode_search_cursor(5), lab_app.encode_search_cursor(2 ** 63), 'garbage'):
+        response = client.get('/api/search', query_string={'q': 'aliquot', 'cursor': cursor})
+        assert response.status_code == 400
@@ -0,0 +1,114 @@
+"""Content-addressed blob storage and its background cleanup"""
+from datetime import datetime
+
+import pytest
+
+from conftest import create_experiment, lab_app, upload_file
+
+db = lab_app.db
+
+
+def wait_for_cleanup():
+    """Block until the background cleanup worker has finished what was scheduled so far"""
+    lab_app.storage_cleanup_executor.submit(lambda: None).result()
+
+
+def only_file(client, exp_id):
+    return client.get(f'/api/experiments/{exp_id}').get_json()['experiment']['files'][0]
+
+
+def blob_jobs(content_hash):
+    return lab_app.StorageCleanupJob.query.filter_by(kind='blob', target=content_hash).all()
+
+
+def test_failed_blob_cleanup_backs_off_and_gc_collects_it(client, monkeypatch):
+    exp_id = create_experiment(client, files=1)
+    file_id = only_file(client, exp_id)['id']
+    with lab_app.app.app_context():
+        content_hash = db.session.get(lab_app.ExperimentFile, file_id).content_hash
+
+    def failing_delete(key):
+        raise OSError('storage unavailable')
+
+    monkeypatch.setattr(lab_app.storage, 'delete', failing_delete)
+    assert client.delete(f'/api/experiments/{exp_id}/files/{file_id}').status_code == 200
+    wait_for_cleanup()
+
+    with lab_app.app.app_context():
+        # One failure per run, and the retry waits for the backoff
+        [job] = blob_jobs(content_hash)
+        assert job.attempts == 1
+        assert job.next_attempt_at > datetime.now()
+        assert lab_app.run_storage_cleanup() == 0
+        assert db.session.get(lab_app.StorageCleanupJob, job.id).attempts == 1
+
+        # Once the job gives up, storage-gc still deletes the unreferenced blob
+        job.attempts = lab_app.STORAGE_CLEANUP_MAX_ATTEMPTS
+        db.session.commit()
+        monkeypatch.undo()
+        assert lab_app.collect_abandoned_blobs() == [lab_app.blob_key(content_hash)]
+        assert db.session.get(lab_app.FileBlob, content_hash) is None
+        assert blob_jobs(content_hash) == []
+        assert not lab_app.storage.exists(lab_app.blob_key(content_hash))
+
+
+def test_orphan_scan_only_deletes_app_keys(client, monkeypatch):
+    exp_id = create_experiment(client, files=1)
+    stale = 1_000_000_000  # Older than any grace period
+    kept_blob = lab_app.blob_key(lab_app.hashlib.sha256(f'{exp_id} file 0'.encode()).hexdigest())
+    keys = {
+        kept_blob: False,
+        lab_app.blob_key('ab' * 32): True,
+        'partial/123e4567-e89b-12d3-a456-426614174000.part': True,
+        'partial/123e4567-e89b-12d3-a456-426614174000/00000000000000000000': True,
+        'tmp/123e4567-e89b-12d3-a456-426614174000': True,
+        '123e4567-e89b-12d3-a456-426614174000.csv': True,
+        'backups/db.sqlite': False,
+        'notes.txt': False,
+        'tmp/other-tool.lock': False,
+    }
+    deleted = []
+    monkeypatch.setattr(lab_app.storage, 'list_keys', lambda: [(key, stale) for key in keys])
+    monkeypatch.setattr(lab_app.storage, 'delete', deleted.append)
+    with lab_app.app.app_context():
+        assert lab_app.collect_orphaned_files(0) == deleted
+    assert sorted(deleted) == sorted(key for key, orphaned in keys.items() if orphaned)
+
+
+def test_orphan_scan_refuses_unprefixed_bucket(monkeypatch):
+    monkeypatch.setattr(lab_app.storage, 'name', 's3')
+    monkeypatch.setattr(lab_app.storage, 'prefix', '', raising=False)
+    with lab_app.app.app_context():
+        with pytest.raises(RuntimeError, match='S3_PREFIX'):
+            lab_app.collect_orphaned_files(0)
+
+
+def blob_row(content_hash):
+    with lab_app.app.app_context():
+        blob = db.session.get(lab_app.FileBlob, content_hash)
+        return blob and (blob.ref_count, lab_app.storage.exists(lab_app.blob_key(content_hash)))
+
+
+def test_identical_uploads_share_one_blob_until_the_last_file_goes(client, monkeypatch):
+    content = b'identical bytes'
+    content_hash = lab_app.hashlib.sha256(content).hexdigest()
+    first, second = create_experiment(client), create_experiment(client)
+    upload_file(client, first, content)
+    upload_file(client, second, content)
+    files = [only_file(client, exp_id) for exp_id in (first, second)]
+    assert blob_row(content_hash) == (2, True)
+
+    # Run cleanup only when the test says so
+    monkeypatch.setattr(lab_app, 'schedule_storage_cleanup', lambda: None)
+    assert client.delete(f'/api/experiments/{first}/files/{files[0]["id"]}').status_code == 200
+    assert blob_row(content_hash) == (1, True)
+    with lab_app.app.app_context():
+        assert blob_jobs(content_hash) == []
+
+    assert client.delete(f'/api/experiments/{second}/files/{files[1]["id"]}').status_code == 200
+    with lab_app.app.app_context():
+        assert len(blob_jobs(content_hash)) == 1
+        lab_app.run_storage_cleanup()
+        assert blob_jobs(content_hash) == []
+    assert blob_row(content_hash) is None
+    assert not lab_app.storage.exists(lab_app.blob_key(content_hash))
@@ -0,0 +1,47 @@
+"""Incremental sync (GET /api/experiments/changes)"""
+from datetime import datetime, timedelta
+
+from conftest import create_experiment, lab_app
+
+
+def backdate(exp_id, hours=1):
+    """Make an experiment and its logs look long synced, older than any cursor's safety margin"""
+    db = lab_app.db
+    earlier = datetime.now() - timedelta(hours=hours)
+    with lab_app.app.app_context():
+        experiment_pk = db.session.scalar(db.select(lab_app.Experiment.id).where(lab_app.Experiment.exp_id == exp_id))
+        db.session.execute(db.update(lab_app.Experiment).where(lab_app.Experiment.id == experiment_pk).values(date_updated=earlier))
+        db.session.execute(
+            db.update(lab_app.ExperimentLog).where(lab_app.ExperimentLog.experiment_id == experiment_pk).values(date_updated=earlier)
+        )
+        db.session.commit()
+
+
+def changes(client, since=None):
+    response = client.get('/api/experiments/changes', query_string={'since': since} if since else {})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_member_leaving_and_rejoining(new_client):
+    reader = new_client()
+    member = new_client()
+    group = reader.post('/api/groups', json={'name': 'Lab'}).get_json()['group']
+    assert member.post('/api/groups/join', json={'code': group['code']}).status_code == 200
+    exp_id = create_experiment(member, logs=2)
+    backdate(exp_id)
+
+    synced = changes(reader)
+    assert exp_id in [exp['id'] for exp in synced['experiments']]
+
+    # The member's experiments disappear from the reader's mirror
+    assert member.post(f'/api/groups/{group["id"]}/leave').status_code == 200
+    after_leave = changes(reader, synced['cursor'])
+    assert {'type': 'experiment', 'id': exp_id, 'expId': exp_id} in after_leave['deleted']
+    assert exp_id not in [exp['id'] for exp in after_leave['experiments']]
+
+    # ...and come back in full when they rejoin, although they predate the cursor
+    assert member.post('/api/groups/join', json={'code': group['code']}).status_code == 200
+    after_rejoin = changes(reader, after_leave['cursor'])
+    assert exp_id in [exp['id'] for exp in after_rejoin['experiments']]
+    assert [log['content'] for log in after_rejoin['logs'] if log['expId'] == exp_id] == ['entry 0', 'entry 1']
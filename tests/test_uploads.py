@@ -0,0 +1,74 @@
+"""Resumable upload sessions: chunk ordering and completion"""
+import hashlib
+
+from conftest import create_experiment, lab_app
+
+CONTENT = b'0123456789abcdef'
+
+
+def start_upload(client, exp_id, size=len(CONTENT)):
+    response = client.post(f'/api/experiments/{exp_id}/uploads', json={'filename': 'data.bin', 'size': size})
+    assert response.status_code == 201
+    return response.get_json()['upload']['uploadId']
+
+
+def put_chunk(client, exp_id, upload_id, start, end, total=len(CONTENT)):
+    return client.put(
+        f'/api/experiments/{exp_id}/uploads/{upload_id}',
+        data=CONTENT[start:end + 1],
+        headers={'Content-Range': f'bytes {start}-{end}/{total}'}
+    )
+
+
+def complete(client, exp_id, upload_id, sha256=None):
+    return client.post(f'/api/experiments/{exp_id}/uploads/{upload_id}/complete', json={'sha256': sha256} if sha256 else {})
+
+
+def test_chunks_must_not_repeat_overlap_or_skip(client):
+    exp_id = create_experiment(client)
+    upload_id = start_upload(client, exp_id)
+    assert put_chunk(client, exp_id, upload_id, 0, 7).get_json()['upload']['offset'] == 8
+
+    for start, end in ((0, 7), (4, 11), (12, 15)):  # Duplicate, overlapping, out of order
+        response = put_chunk(client, exp_id, upload_id, start, end)
+        assert response.status_code == 409
+        assert response.get_json()['offset'] == 8
+
+    assert put_chunk(client, exp_id, upload_id, 8, 15).status_code == 200
+    response = complete(client, exp_id, upload_id, hashlib.sha256(CONTENT).hexdigest())
+    assert response.status_code == 201
+    file_id = response.get_json()['file']['id']
+    download = client.get(f'/api/experiments/{exp_id}/files/{file_id}/download')
+    assert download.data == CONTENT
+
+
+def test_complete_checks_sha256(client):
+    exp_id = create_experiment(client)
+    upload_id = start_upload(client, exp_id)
+    assert put_chunk(client, exp_id, upload_id, 0, 15).status_code == 200
+
+    response = complete(client, exp_id, upload_id, '0' * 64)
+    assert response.status_code == 400
+    assert response.get_json()['sha256'] == hashlib.sha256(CONTENT).hexdigest()
+    # The session stays open for a retry
+    assert client.get(f'/api/experiments/{exp_id}/uploads/{upload_id}').get_json()['upload']['status'] == 'open'
+    assert complete(client, exp_id, upload_id, hashlib.sha256(CONTENT).hexdigest()).status_code == 201
+
+
+def test_session_being_completed_refuses_chunks_and_second_complete(client):
+    exp_id = create_experiment(client)
+    upload_id = start_upload(client, exp_id, size=None)
+    assert put_chunk(client, exp_id, upload_id, 0, 7, total='*').status_code == 200
+
+    # Another request has claimed the completion
+    with lab_app.app.app_context():
+        assert lab_app.claim_upload_completion(upload_id, 8)
+    assert complete(client, exp_id, upload_id).status_code == 409
+    assert put_chunk(client, exp_id, upload_id, 8, 15, total='*').status_code == 409
+
+    with lab_app.app.app_context():
+        lab_app.release_upload_completion(upload_id)
+    response = complete(client, exp_id, upload_id)
+    assert response.status_code == 201
+    assert response.get_json()['file']['fileSize'] == 8
+    assert complete(client, exp_id, upload_id).status_code == 404